@@ -0,0 +1,54 @@
+"""
+Compare Room.receive_guest with the old per-day dict loop.
+
+    python -m benchmarks.room_receive_guest
+"""
+import timeit
+import typing as tp
+
+from src.guest import Guest
+from src.room import Room
+
+REPEATS = 2000
+
+
+class DictLoopRoom:
+    """Availability check the way Room did it before FreeIntervals"""
+
+    def __init__(self, horizon: int):
+        self._occupation: tp.Dict[int, bool] = {day: False for day in range(horizon)}
+
+    def receive_guest(self, new_guest: Guest) -> bool:
+        is_room_busy = False
+        for day in range(new_guest.day_in, new_guest.day_out+1):
+            is_room_busy = is_room_busy or self._occupation[day]
+        if is_room_busy:
+            return False
+
+        for day in range(new_guest.day_in, new_guest.day_out+1):
+            self._occupation[day] = True
+        return True
+
+
+def _fill(room, horizon: int, stay_days: int):
+    """Book every other stay-long slot, so the room is half busy"""
+    for day_in in range(0, horizon - stay_days, 2 * stay_days):
+        room.receive_guest(Guest(day_in=day_in, day_out=day_in + stay_days - 1,
+                                 room_preferences=0, discount=0))
+
+
+def bench(stay_days: int):
+    horizon = stay_days * 100
+    rooms = {'dict loop': DictLoopRoom(horizon), 'free intervals': Room(price=1)}
+    # the probe overlaps the last booking only on its last day
+    probe = Guest(day_in=horizon - 3 * stay_days + 1, day_out=horizon - 2 * stay_days,
+                  room_preferences=0, discount=0)
+    for name, room in rooms.items():
+        _fill(room, horizon, stay_days)
+        seconds = timeit.timeit(lambda: room.receive_guest(probe), number=REPEATS)
+        print(f'{stay_days:>4} day stay, {name:<15}: {seconds / REPEATS * 1e6:8.2f} us per probe')
+
+
+if __name__ == '__main__':
+    for stay_days in (30, 365):
+        bench(stay_days)
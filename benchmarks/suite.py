@@ -0,0 +1,317 @@
+"""
+Benchmarks of the Room, Hotel and HotelModel hot paths at several scales.
+
+    python -m benchmarks.suite run --output bench.json        # rooms up to 100k, horizons up to 3650 days
+    python -m benchmarks.suite run --quick --output bench.json
+    python -m benchmarks.suite curves bench.json
+    python -m benchmarks.suite compare baseline.json bench.json --threshold 0.2
+
+Every case is timed `repeat` times and the fastest time is kept. compare
+exits with 1 when a case got slower than the baseline by more than the
+threshold, so a new engine has to pass it against the reference results.
+"""
+import argparse
+import datetime
+import json
+import math
+import platform
+import random
+import sys
+import time
+import typing as tp
+
+from src.guest import Guest, GuestBatch
+from src.modeling import ENGINES, STATISTICS, HotelModel, _hotel_class
+from src.room import Room
+from src.utils import HOURS_PER_DAY
+
+ROOM_SCALES = (10, 100, 1_000, 10_000, 100_000)
+HORIZON_SCALES = (30, 365, 3650)
+ARRIVAL_INTERVALS = (1, 4, 24) # hours between arrivals
+QUICK_ROOM_SCALES = (10, 100, 1_000)
+QUICK_HORIZON_SCALES = (30, 365)
+
+# KPIs besides the statistics snapshot: per-room lists for the UI
+ROOM_LIST_KPIS = (
+    'current_luxury_occupancy_str',
+    'current_junior_occupancy_str',
+    'current_double_occupancy_str',
+    'current_single_occupancy_str',
+    'current_luxury_occupancy_today',
+    'current_junior_occupancy_today',
+    'current_double_occupancy_today',
+    'current_single_occupancy_today',
+)
+BASE_CONFIG: tp.Dict[str, tp.Any] = {
+    'modeling_days': 30,
+    'model_cost_of_luxury_rooms': 5,
+    'model_cost_of_junior_suites': 4,
+    'model_cost_of_double_rooms': 2,
+    'model_cost_of_single_rooms': 1,
+    'new_application_hours': (1, 3),
+    'discount_percent': 20,
+    'tick_hours': 4,
+}
+STAY_HORIZON_DAYS = 30 # guests of the hotel level cases arrive in the first 30 days
+KPI_READS = 20 # reads per timing, a single read is too short to time alone
+
+# a result: benchmark, engine, scale name and value, seconds per operation
+Result = tp.Dict[str, tp.Any]
+
+
+def _available_engines() -> tp.List[str]:
+    engines = []
+    for engine in ENGINES:
+        try:
+            _hotel_class(engine)
+        except ImportError: # the table engine needs numpy
+            continue
+        engines.append(engine)
+    return engines
+
+
+def _best_time(function: tp.Callable[[], tp.Any], setup: tp.Callable[[], tp.Any], repeat: int) -> float:
+    """Fastest of `repeat` timed calls, setup runs untimed before each"""
+    best = math.inf
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        function(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _rooms_config(rooms: int) -> tp.Dict[str, int]:
+    """rooms split between the categories, the rest goes to single rooms"""
+    quarter = max(1, rooms // 4)
+    return {
+        'model_number_of_luxury_rooms': quarter,
+        'model_number_of_junior_suites': quarter,
+        'model_number_of_double_rooms': quarter,
+        'model_number_of_single_rooms': max(1, rooms - 3 * quarter),
+    }
+
+
+def _hotel(engine: str, rooms: int):
+    config = {**BASE_CONFIG, **_rooms_config(rooms)}
+    return _hotel_class(engine)(
+        number_of_luxury_rooms=config['model_number_of_luxury_rooms'],
+        cost_of_luxury_rooms=config['model_cost_of_luxury_rooms'],
+        number_of_junior_suites=config['model_number_of_junior_suites'],
+        cost_of_junior_suites=config['model_cost_of_junior_suites'],
+        number_of_double_rooms=config['model_number_of_double_rooms'],
+        cost_of_double_rooms=config['model_cost_of_double_rooms'],
+        number_of_single_rooms=config['model_number_of_single_rooms'],
+        cost_of_single_rooms=config['model_cost_of_single_rooms'],
+        discount_percent=config['discount_percent'],
+    )
+
+
+def _guests(count: int, seed: int = 0) -> GuestBatch:
+    """count guests staying 1-7 days within the first STAY_HORIZON_DAYS, in arrival order"""
+    rng = random.Random(seed)
+    guests = GuestBatch()
+    for number in range(count):
+        day_in = rng.randint(0, STAY_HORIZON_DAYS - 1)
+        guest = Guest(day_in=day_in, day_out=day_in + rng.randint(1, 7), room_preferences=rng.randint(0, 3), discount=0)
+        guests.append(guest, number * STAY_HORIZON_DAYS * HOURS_PER_DAY // max(count, 1))
+    return guests
+
+
+def bench_room_receive_guest(horizons: tp.Sequence[int], repeat: int) -> tp.List[Result]:
+    """Probe a half busy room whose bookings span the horizon"""
+    probes = 1000
+    results = []
+    for horizon in horizons:
+        def setup():
+            room = Room(price=1)
+            for day_in in range(0, horizon - 2, 4):
+                room.receive_guest(Guest(day_in=day_in, day_out=day_in + 1, room_preferences=0, discount=0))
+            return room
+        probe = Guest(day_in=horizon // 2, day_out=horizon // 2 + 3, room_preferences=0, discount=0)
+
+        def run(room):
+            for _ in range(probes):
+                room.receive_guest(probe)
+        seconds = _best_time(run, setup, repeat)
+        results.append(_result('room_receive_guest', 'object', 'horizon_days', horizon, seconds / probes))
+    return results
+
+
+def bench_hotel_recieve_guests(rooms_scales: tp.Sequence[int], engines: tp.Sequence[str], repeat: int) -> tp.List[Result]:
+    """Admit two guests per room into an empty hotel, seconds per guest"""
+    results = []
+    for engine in engines:
+        for rooms in rooms_scales:
+            guests = _guests(2 * rooms)
+            seconds = _best_time(lambda hotel: hotel.recieve_guests(guests), lambda: _hotel(engine, rooms), repeat)
+            results.append(_result('hotel_recieve_guests', engine, 'rooms', rooms, seconds / len(guests)))
+    return results
+
+
+def bench_hotel_tick(rooms_scales: tp.Sequence[int], engines: tp.Sequence[str], repeat: int) -> tp.List[Result]:
+    """Daily ticks through the stays of two guests per room, seconds per tick"""
+    days = STAY_HORIZON_DAYS + 8
+    results = []
+    for engine in engines:
+        for rooms in rooms_scales:
+            guests = _guests(2 * rooms)
+
+            def setup():
+                hotel = _hotel(engine, rooms)
+                hotel.recieve_guests(guests)
+                return hotel
+
+            def run(hotel):
+                for _ in range(days):
+                    hotel.tick(HOURS_PER_DAY)
+            seconds = _best_time(run, setup, repeat)
+            results.append(_result('hotel_tick', engine, 'rooms', rooms, seconds / days))
+    return results
+
+
+def bench_kpis(rooms_scales: tp.Sequence[int], engines: tp.Sequence[str], repeat: int) -> tp.List[Result]:
+    """Every KPI property of a model halfway through its run, seconds per read"""
+    results = []
+    for engine in engines:
+        for rooms in rooms_scales:
+            config = {**BASE_CONFIG, **_rooms_config(rooms), 'new_application_hours': (1, 1)}
+            model = HotelModel(**config, engine=engine, seed=0)
+            model.run(model.total_ticks // 2)
+            for name in (*STATISTICS, *ROOM_LIST_KPIS):
+                def run(_):
+                    for _ in range(KPI_READS):
+                        getattr(model, name)
+                seconds = _best_time(run, lambda: None, repeat)
+                results.append(_result(f'kpi.{name}', engine, 'rooms', rooms, seconds / KPI_READS))
+    return results
+
+
+def bench_model_run(horizons: tp.Sequence[int], engines: tp.Sequence[str], repeat: int) -> tp.List[Result]:
+    """HotelModel.run to the end with the UI room counts, by horizon and by arrival interval"""
+    results = []
+    rooms = {
+        'model_number_of_luxury_rooms': 2,
+        'model_number_of_junior_suites': 2,
+        'model_number_of_double_rooms': 2,
+        'model_number_of_single_rooms': 14,
+    }
+    for engine in engines:
+        for horizon in horizons:
+            config = {**BASE_CONFIG, **rooms, 'modeling_days': horizon}
+            seconds = _best_time(lambda model: model.run(), lambda: HotelModel(**config, engine=engine, seed=0), repeat)
+            results.append(_result('model_run', engine, 'horizon_days', horizon, seconds))
+        for hours in ARRIVAL_INTERVALS:
+            config = {**BASE_CONFIG, **rooms, 'modeling_days': 365, 'new_application_hours': (hours, hours)}
+            seconds = _best_time(lambda model: model.run(), lambda: HotelModel(**config, engine=engine, seed=0), repeat)
+            results.append(_result('model_run_365_days', engine, 'arrival_hours', hours, seconds))
+    return results
+
+
+def _result(benchmark: str, engine: str, scale: str, value: int, seconds: float) -> Result:
+    return {'benchmark': benchmark, 'engine': engine, 'scale': scale, 'value': value, 'seconds': seconds}
+
+
+def _key(result: Result) -> str:
+    return f"{result['benchmark']}/{result['engine']}/{result['scale']}={result['value']}"
+
+
+def run_suite(quick: bool = False, repeat: int = 3, only: tp.Optional[str] = None) -> tp.Dict[str, tp.Any]:
+    rooms_scales = QUICK_ROOM_SCALES if quick else ROOM_SCALES
+    horizons = QUICK_HORIZON_SCALES if quick else HORIZON_SCALES
+    engines = _available_engines()
+    benchmarks = {
+        'room_receive_guest': lambda: bench_room_receive_guest(horizons, repeat),
+        'hotel_recieve_guests': lambda: bench_hotel_recieve_guests(rooms_scales, engines, repeat),
+        'hotel_tick': lambda: bench_hotel_tick(rooms_scales, engines, repeat),
+        'kpis': lambda: bench_kpis(rooms_scales, engines, repeat),
+        'model_run': lambda: bench_model_run(horizons, engines, repeat),
+    }
+    results = []
+    for name, bench in benchmarks.items():
+        if only is None or only == name:
+            print(f'running {name}', file=sys.stderr)
+            results.extend(bench())
+    return {
+        'created': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'quick': quick,
+        'results': results,
+    }
+
+
+def print_curves(report: tp.Dict[str, tp.Any], output: tp.TextIO = sys.stdout):
+    """Time per scale of every benchmark, with the growth exponent between scales"""
+    series: tp.Dict[tp.Tuple[str, str, str], tp.List[tp.Tuple[int, float]]] = {}
+    for result in report['results']:
+        series.setdefault((result['benchmark'], result['engine'], result['scale']), []).append(
+            (result['value'], result['seconds'])
+        )
+    for (benchmark, engine, scale), points in series.items():
+        points.sort()
+        print(f'{benchmark} [{engine}]', file=output)
+        previous = None
+        for value, seconds in points:
+            growth = ''
+            if previous is not None and previous[1] > 0 and value != previous[0]:
+                exponent = math.log(seconds / previous[1]) / math.log(value / previous[0])
+                growth = f'  ~ {scale}^{exponent:.2f}'
+            print(f'  {scale}={value:<8} {seconds * 1e6:12.2f} us{growth}', file=output)
+            previous = (value, seconds)
+
+
+def compare(baseline: tp.Dict[str, tp.Any], current: tp.Dict[str, tp.Any], threshold: float, output: tp.TextIO = sys.stdout) -> int:
+    """Print the ratio of every common case, return how many got slower than the threshold allows"""
+    base_results = {_key(result): result['seconds'] for result in baseline['results']}
+    regressions = 0
+    for result in current['results']:
+        key = _key(result)
+        if key not in base_results:
+            print(f'  new  {key}', file=output)
+            continue
+        ratio = result['seconds'] / base_results[key] if base_results[key] > 0 else math.inf
+        regressed = ratio > 1 + threshold
+        regressions += regressed
+        print(f"{'SLOW' if regressed else '  ok'} {key}: x{ratio:.2f}", file=output)
+    return regressions
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='run the benchmarks and write the results as JSON')
+    run_parser.add_argument('--quick', action='store_true', help='small scales only')
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('--only', help='one benchmark group: room_receive_guest, hotel_recieve_guests, hotel_tick, kpis, model_run')
+    run_parser.add_argument('--output', help='JSON file to write, stdout by default')
+    curves_parser = commands.add_parser('curves', help='print time against scale from a results file')
+    curves_parser.add_argument('results')
+    compare_parser = commands.add_parser('compare', help='flag cases slower than a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('results')
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help='allowed slowdown, 0.2 is 20%%')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        report = run_suite(args.quick, args.repeat, args.only)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as output:
+                json.dump(report, output, indent=2)
+        else:
+            json.dump(report, sys.stdout, indent=2)
+            sys.stdout.write('\n')
+        print_curves(report, sys.stderr)
+        return 0
+    if args.command == 'curves':
+        with open(args.results, encoding='utf-8') as results:
+            print_curves(json.load(results))
+        return 0
+    with open(args.baseline, encoding='utf-8') as baseline, open(args.results, encoding='utf-8') as results:
+        regressions = compare(json.load(baseline), json.load(results), args.threshold)
+    print(f'{regressions} regression(s) over {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,20 @@
+import os
+
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
 )
 
 from src.ui import Ui_HotelModelUI
+from src.utils import configure_logging
 
 if __name__ == "__main__":
+    configure_logging(os.environ.get('HOTEL_LOG_LEVEL', 'WARNING'), log_dir='./logs')
     app = QApplication([])
     window = QMainWindow()
     window.setFixedSize(1300, 800)
     ui = Ui_HotelModelUI()
+    ui.show_perf_stats = os.environ.get('HOTEL_PERF_STATS') == '1'
     ui.setupUi(window)
     window.show()
     app.exec()
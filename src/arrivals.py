@@ -0,0 +1,70 @@
+import typing as tp
+
+import numpy as np
+
+from src.guest import GuestBatch
+from src.utils import HOURS_PER_DAY
+
+# same distributions as _generate_customers in src.modeling
+MIN_LIFE_EXPECTANCY = 1
+MAX_LIFE_EXPECTANCY = 7
+MIN_FURTHEST_BOOKING_DAY = 0
+MAX_FURTHEST_BOOKING_DAY = 6
+NUMBER_OF_CATEGORIES = 4
+
+ARRIVALS_CHUNK_SIZE = 65536
+
+
+def _uniform_ints(uniform: np.ndarray, low: int, high: int) -> np.ndarray:
+    """Integers in [low, high] from uniform [0, 1) draws by inverse transform"""
+    values = np.floor(uniform * (high - low + 1)).astype(np.int64)
+    return low + np.minimum(values, high - low)
+
+
+def generate_arrival_columns(
+    modeling_days: int,
+    new_application_hours: tp.Tuple[int, int],
+    rng: np.random.Generator,
+    chunk_size: int = ARRIVALS_CHUNK_SIZE,
+    antithetic: bool = False,
+) -> tp.Iterator[GuestBatch]:
+    """
+    Generate customers like _generate_customers, but draw a whole chunk
+    of arrivals at once. Chunks come as GuestBatch in arrival order
+    until the horizon ends, no Guest objects are built.
+    With antithetic every draw u becomes 1 - u: the same distribution,
+    negatively correlated with the stream of the same generator state.
+    """
+    low_hours, high_hours = new_application_hours
+    if high_hours < 1 or low_hours > high_hours:
+        raise ValueError(f'bad new_application_hours {new_application_hours}')
+    horizon_hours = modeling_days * HOURS_PER_DAY
+    current_hour = 0
+    while current_hour < horizon_hours:
+        # gaps, walk-in flags, booking days, stay lengths, room preferences
+        uniform = rng.random((5, chunk_size))
+        if antithetic:
+            uniform = 1.0 - uniform
+        gaps = _uniform_ints(uniform[0], low_hours, high_hours)
+        arrival_hour = np.empty(chunk_size, dtype=np.int64)
+        arrival_hour[0] = current_hour
+        np.cumsum(gaps[:-1], out=arrival_hour[1:])
+        arrival_hour[1:] += current_hour
+
+        in_horizon = int(np.searchsorted(arrival_hour, horizon_hours))
+        walk_in = uniform[1, :in_horizon] >= 0.5
+        day_in = np.where(
+            walk_in,
+            arrival_hour[:in_horizon] // HOURS_PER_DAY,
+            _uniform_ints(uniform[2, :in_horizon], MIN_FURTHEST_BOOKING_DAY, MAX_FURTHEST_BOOKING_DAY),
+        )
+        day_out = day_in + _uniform_ints(uniform[3, :in_horizon], MIN_LIFE_EXPECTANCY, MAX_LIFE_EXPECTANCY)
+        room_preferences = _uniform_ints(uniform[4, :in_horizon], 0, NUMBER_OF_CATEGORIES - 1)
+        yield GuestBatch(
+            day_in=day_in,
+            day_out=day_out,
+            room_preferences=room_preferences,
+            arrival_hour=arrival_hour[:in_horizon],
+        )
+
+        current_hour = int(arrival_hour[-1] + gaps[-1])
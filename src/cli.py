@@ -0,0 +1,177 @@
+"""
+Headless runner for HotelModel, no Qt needed.
+
+    python -m src.cli --modeling-days 365 --format csv
+    python -m src.cli --config scenario.json --output result.json
+    python -m src.cli --seed 7 --check-engines
+    python -m src.cli --modeling-days 365 --steady-state
+"""
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import typing as tp
+
+from src.hotel import ROOM_CHOICES, FIRST_FIT
+from src.modeling import (
+    ARRIVAL_GENERATORS,
+    ENGINES,
+    OBJECT_ENGINE,
+    PYTHON_ARRIVALS,
+    HotelModel,
+)
+from src.perf import format_perf_stats
+from src.seeding import resolve_seed
+from src.trace import TraceWriter
+from src.utils import configure_logging
+
+# the same keys and defaults as the model_config built by the UI
+DEFAULT_MODEL_CONFIG: tp.Dict[str, tp.Any] = {
+    'modeling_days': 30,
+    'model_number_of_luxury_rooms': 2,
+    'model_cost_of_luxury_rooms': 5,
+    'model_number_of_junior_suites': 2,
+    'model_cost_of_junior_suites': 4,
+    'model_number_of_double_rooms': 2,
+    'model_cost_of_double_rooms': 2,
+    'model_number_of_single_rooms': 14,
+    'model_cost_of_single_rooms': 1,
+    'new_application_hours': (1, 3),
+    'discount_percent': 20,
+    'tick_hours': 4,
+}
+# HotelModel options the UI does not set
+DEFAULT_MODEL_OPTIONS: tp.Dict[str, tp.Any] = {
+    'room_choice': FIRST_FIT,
+    'engine': OBJECT_ENGINE,
+    'arrivals': PYTHON_ARRIVALS,
+    'seed': None,
+    'legacy_fallback': False,
+    'steady_state': False,
+}
+OUTPUT_FORMATS = ('json', 'csv')
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+
+
+def _flag(key: str) -> str:
+    return '--' + key.replace('_', '-')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog='python -m src.cli',
+        description='Run the hotel model to the end and print the final statistics.',
+    )
+    parser.add_argument('--config', help='JSON file with model_config keys, flags override it')
+    for key, value in DEFAULT_MODEL_CONFIG.items():
+        if key == 'new_application_hours':
+            parser.add_argument(_flag(key), dest=key, type=int, nargs=2, metavar=('LOW', 'HIGH'))
+        else:
+            parser.add_argument(_flag(key), dest=key, type=int, metavar='N')
+    parser.add_argument('--room-choice', dest='room_choice', choices=ROOM_CHOICES)
+    parser.add_argument('--engine', dest='engine', choices=ENGINES)
+    parser.add_argument('--arrivals', dest='arrivals', choices=ARRIVAL_GENERATORS)
+    parser.add_argument('--seed', dest='seed', type=int)
+    parser.add_argument(
+        '--legacy-fallback',
+        dest='legacy_fallback',
+        action='store_true',
+        default=None,
+        help='book a full-price-rejected guest into every fallback category with a room, as older versions did',
+    )
+    parser.add_argument(
+        '--steady-state',
+        dest='steady_state',
+        action='store_true',
+        default=None,
+        help='add the warm-up length and occupation after the warm-up to the statistics',
+    )
+    parser.add_argument(
+        '--check-engines',
+        action='store_true',
+        help='run every engine on the same seed and fail on any statistics difference',
+    )
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='json')
+    parser.add_argument('--perf-stats', action='store_true', help='print phase timings and counters to stderr')
+    parser.add_argument('--trace', help='write a binary event trace of the run to this file')
+    parser.add_argument('--log-level', dest='log_level', choices=LOG_LEVELS, default='WARNING')
+    parser.add_argument('--log-dir', dest='log_dir', help='write the log to a file there, stderr by default')
+    parser.add_argument('--output', help='file to write, stdout by default')
+    return parser
+
+
+def model_config_from_args(args: argparse.Namespace) -> tp.Dict[str, tp.Any]:
+    """Defaults, then the config file, then flags"""
+    config = {**DEFAULT_MODEL_CONFIG, **DEFAULT_MODEL_OPTIONS}
+    if args.config:
+        with open(args.config, encoding='utf-8') as config_file:
+            file_config = json.load(config_file)
+        unknown = set(file_config) - set(config)
+        if unknown:
+            raise ValueError(f'unknown keys in {args.config}: {sorted(unknown)}')
+        config.update(file_config)
+    for key in config:
+        value = getattr(args, key, None)
+        if value is not None:
+            config[key] = value
+    config['new_application_hours'] = tuple(config['new_application_hours'])
+    return config
+
+
+def write_statistics(statistics: tp.Dict[str, tp.Any], output_format: str, output: tp.TextIO):
+    if output_format == 'json':
+        json.dump(statistics, output, indent=2)
+        output.write('\n')
+    else:
+        writer = csv.DictWriter(output, fieldnames=list(statistics))
+        writer.writeheader()
+        writer.writerow(statistics)
+
+
+def check_engines(config: tp.Dict[str, tp.Any]) -> int:
+    from src.replications import engine_differences
+    config = dict(config)
+    model_seed = resolve_seed(config.pop('seed'))
+    del config['engine']
+    differences = engine_differences(config, model_seed)
+    for tick, engine, name, expected, actual in differences:
+        print(f'tick {tick}: {engine} {name} = {actual!r}, {OBJECT_ENGINE} gives {expected!r}')
+    if differences:
+        return 1
+    print(f'engines {", ".join(ENGINES)} agree on seed {model_seed}')
+    return 0
+
+
+def main(argv: tp.Optional[tp.Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    configure_logging(args.log_level, args.log_dir)
+    try:
+        config = model_config_from_args(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    if args.check_engines:
+        return check_engines(config)
+
+    with contextlib.ExitStack() as stack:
+        trace = stack.enter_context(TraceWriter(args.trace)) if args.trace else None
+        model = HotelModel(**config, trace=trace, instrument=args.perf_stats)
+        statistics = model.run()
+    if config['seed'] is None:
+        # stdout keeps only the statistics, the drawn seed is still needed to repeat the run
+        print(f'drawn seed {model.seed}, repeat the run with --seed {model.seed}', file=sys.stderr)
+    if args.perf_stats:
+        print(format_perf_stats(model.perf_stats()), file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as output:
+            write_statistics(statistics, args.format, output)
+    else:
+        write_statistics(statistics, args.format, sys.stdout)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""
+Scenario comparison with common random numbers.
+
+Every configuration of a replication gets the same seed, so all of them see
+the same arrival stream and the noise of the arrivals cancels out of the
+paired differences. With antithetic=True a replication is the mean of a pair
+of runs on mirrored streams (numpy arrivals only).
+"""
+import typing as tp
+from dataclasses import dataclass, field
+
+from src.estimates import KpiSummary, summarize_samples
+from src.modeling import PYTHON_ARRIVALS
+from src.replications import Record, map_jobs, record_names, run_replication, summarize_records
+from src.seeding import Seed, spawn_seeds
+
+# keys that define the arrival stream, configurations must agree on them
+ARRIVAL_KEYS = ('modeling_days', 'new_application_hours', 'arrivals')
+
+
+def _common_arrivals(configs: tp.Sequence[tp.Dict[str, tp.Any]]):
+    for key in ARRIVAL_KEYS:
+        values = {repr(config.get(key, PYTHON_ARRIVALS if key == 'arrivals' else None)) for config in configs}
+        if len(values) > 1:
+            raise ValueError(f'configurations need the same {key} to share arrivals, got {sorted(values)}')
+
+
+@dataclass
+class ComparisonResult:
+    seeds: tp.List[Seed]
+    # records[config][replication]
+    records: tp.List[tp.List[Record]]
+    confidence: float = 0.95
+    summaries: tp.List[tp.Dict[str, KpiSummary]] = field(init=False)
+
+    def __post_init__(self):
+        self.summaries = [summarize_records(records, self.confidence) for records in self.records]
+
+    @property
+    def replications(self) -> int:
+        return len(self.seeds)
+
+    def samples(self, kpi: str, config: int) -> tp.List[float]:
+        index = record_names(self.records[config]).index(kpi)
+        return [record[index] for record in self.records[config]]
+
+    def difference(self, kpi: str, config: int, reference: int = 0) -> KpiSummary:
+        """Mean and CI of kpi(config) - kpi(reference) over paired replications"""
+        return summarize_samples(
+            [value - base for value, base in zip(self.samples(kpi, config), self.samples(kpi, reference))],
+            self.confidence,
+        )
+
+    def differences(self, config: int, reference: int = 0) -> tp.Dict[str, KpiSummary]:
+        """Differences of the KPIs both configurations have"""
+        names = min(record_names(self.records[config]), record_names(self.records[reference]), key=len)
+        return {name: self.difference(name, config, reference) for name in names}
+
+
+def compare_configs(
+    configs: tp.Sequence[tp.Dict[str, tp.Any]],
+    replications: int,
+    seed: tp.Optional[Seed] = None,
+    workers: tp.Optional[int] = None,
+    confidence: float = 0.95,
+    antithetic: bool = False,
+) -> ComparisonResult:
+    """
+    Run replications of several HotelModel configurations (keyword arguments
+    without seed) on common random numbers and keep the paired records.
+    """
+    _common_arrivals(configs)
+    seeds = spawn_seeds(seed, replications)
+    variants = [{'antithetic': False}, {'antithetic': True}] if antithetic else [{}]
+    jobs = [
+        ({**config, **variant}, replication_seed)
+        for config in configs
+        for replication_seed in seeds
+        for variant in variants
+    ]
+    runs = map_jobs(run_replication, jobs, workers)
+
+    records = []
+    per_config = len(seeds) * len(variants)
+    for start in range(0, len(runs), per_config):
+        config_runs = runs[start:start + per_config]
+        records.append([
+            tuple(sum(values) / len(variants) for values in zip(*config_runs[index:index + len(variants)]))
+            for index in range(0, per_config, len(variants))
+        ])
+    return ComparisonResult(seeds=seeds, records=records, confidence=confidence)
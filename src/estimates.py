@@ -0,0 +1,144 @@
+import math
+import statistics
+import typing as tp
+from dataclasses import dataclass
+
+
+# above this many degrees of freedom the Cornish-Fisher expansion alone
+# is within 1e-10 of the quantile for the usual confidence levels
+EXPANSION_DEGREES_OF_FREEDOM = 1000
+
+
+def t_cdf(value: float, degrees_of_freedom: int) -> float:
+    """
+    Cumulative distribution function of Student's t distribution
+    for integer degrees of freedom, the finite series of
+    Abramowitz and Stegun 26.7.3 and 26.7.4.
+    """
+    theta = math.atan(value / math.sqrt(degrees_of_freedom))
+    cos_squared = math.cos(theta) ** 2
+    if degrees_of_freedom % 2:
+        term = series = 1.0
+        for k in range(2, degrees_of_freedom - 1, 2):
+            term *= k / (k + 1) * cos_squared
+            series += term
+        sin_cos = math.sin(theta) * math.cos(theta) if degrees_of_freedom > 1 else 0.0
+        probability = 2 / math.pi * (theta + sin_cos * series)
+    else:
+        term = series = 1.0
+        for k in range(1, degrees_of_freedom - 2, 2):
+            term *= k / (k + 1) * cos_squared
+            series += term
+        probability = math.sin(theta) * series
+    return (1 + probability) / 2
+
+
+def _t_pdf(value: float, degrees_of_freedom: int) -> float:
+    n = degrees_of_freedom
+    log_norm = math.lgamma((n + 1) / 2) - math.lgamma(n / 2) - 0.5 * math.log(n * math.pi)
+    return math.exp(log_norm - (n + 1) / 2 * math.log1p(value * value / n))
+
+
+def _cornish_fisher(probability: float, degrees_of_freedom: int) -> float:
+    """Expansion around the normal quantile, Abramowitz and Stegun 26.7.5"""
+    z = statistics.NormalDist().inv_cdf(probability)
+    n = float(degrees_of_freedom)
+    return (
+        z
+        + (z**3 + z) / (4 * n)
+        + (5 * z**5 + 16 * z**3 + 3 * z) / (96 * n**2)
+        + (3 * z**7 + 19 * z**5 + 17 * z**3 - 15 * z) / (384 * n**3)
+        + (79 * z**9 + 776 * z**7 + 1482 * z**5 - 1920 * z**3 - 945 * z) / (92160 * n**4)
+    )
+
+
+def t_quantile(probability: float, degrees_of_freedom: int) -> float:
+    """
+    Quantile of Student's t distribution. Closed form for 1 and 2 degrees
+    of freedom, otherwise Newton steps on t_cdf from the Cornish-Fisher
+    expansion, which alone is off by 0.046 for 3 degrees of freedom
+    at probability 0.995.
+    """
+    if degrees_of_freedom <= 0:
+        return math.inf
+    if degrees_of_freedom == 1:
+        return math.tan(math.pi * (probability - 0.5))
+    if degrees_of_freedom == 2:
+        return (2 * probability - 1) / math.sqrt(2 * probability * (1 - probability))
+    quantile = _cornish_fisher(probability, degrees_of_freedom)
+    if degrees_of_freedom > EXPANSION_DEGREES_OF_FREEDOM:
+        return quantile
+    for _ in range(50):
+        step = (t_cdf(quantile, degrees_of_freedom) - probability) / _t_pdf(quantile, degrees_of_freedom)
+        quantile -= step
+        if abs(step) <= 1e-12 * max(1.0, abs(quantile)):
+            break
+    return quantile
+
+
+@dataclass
+class KpiSummary:
+    """Mean of a KPI over replications with its confidence interval"""
+    mean: float
+    std: float
+    ci_low: float
+    ci_high: float
+    replications: int
+
+    @property
+    def half_width(self) -> float:
+        return (self.ci_high - self.ci_low) / 2
+
+    @property
+    def relative_half_width(self) -> float:
+        """CI half-width relative to the mean, inf for a zero mean"""
+        if self.mean == 0:
+            return 0.0 if self.half_width == 0 else math.inf
+        return self.half_width / abs(self.mean)
+
+
+def summarize(mean: float, std: float, replications: int, confidence: float = 0.95) -> KpiSummary:
+    if replications < 2:
+        return KpiSummary(mean, math.nan, -math.inf, math.inf, replications)
+    half_width = t_quantile((1 + confidence) / 2, replications - 1) * std / math.sqrt(replications)
+    return KpiSummary(mean, std, mean - half_width, mean + half_width, replications)
+
+
+def summarize_samples(samples: tp.Sequence[float], confidence: float = 0.95) -> KpiSummary:
+    mean = statistics.fmean(samples) if samples else math.nan
+    std = statistics.stdev(samples) if len(samples) > 1 else math.nan
+    return summarize(mean, std, len(samples), confidence)
+
+
+class RunningStatistics:
+    """Online mean and variance of a KPI (Welford), samples are not kept"""
+
+    def __init__(self):
+        self._count = 0
+        self._mean = 0.0
+        self._squares = 0.0 # sum of squared deviations from the mean
+
+    def add(self, value: float):
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._squares += delta * (value - self._mean)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self._count else math.nan
+
+    @property
+    def variance(self) -> float:
+        return self._squares / (self._count - 1) if self._count > 1 else math.nan
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def summary(self, confidence: float = 0.95) -> KpiSummary:
+        return summarize(self.mean, self.std, self._count, confidence)
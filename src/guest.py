@@ -1,3 +1,5 @@
+import typing as tp
+from array import array
 from dataclasses import dataclass
 
 
@@ -12,4 +14,142 @@ class Guest:
         self.discount = new_discount
 
     def room_preferences_int(self):
-        return self.room_preferences
\ No newline at end of file
+        return self.room_preferences
+
+
+class GuestView:
+    """Guest-like access to one row of a GuestBatch, changes go to the batch"""
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch: 'GuestBatch', index: int):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def day_in(self) -> int:
+        return self._batch.day_in[self._index]
+
+    @property
+    def day_out(self) -> int:
+        return self._batch.day_out[self._index]
+
+    @property
+    def room_preferences(self) -> int:
+        return self._batch.room_preferences[self._index]
+
+    @property
+    def discount(self) -> int:
+        return self._batch.discount[self._index]
+
+    @property
+    def arrival_hour(self) -> int:
+        return self._batch.arrival_hour[self._index]
+
+    def add_discount(self, new_discount):
+        self._batch.discount[self._index] = new_discount
+
+    def room_preferences_int(self):
+        return self.room_preferences
+
+    def to_guest(self) -> Guest:
+        return Guest(
+            day_in=self.day_in,
+            day_out=self.day_out,
+            room_preferences=self.room_preferences,
+            discount=self.discount,
+        )
+
+    def __repr__(self) -> str:
+        return (f'Guest(day_in={self.day_in}, day_out={self.day_out}, '
+                f'room_preferences={self.room_preferences}, discount={self.discount})')
+
+
+class GuestBatch:
+    """
+    Guests in columnar form: parallel typed arrays instead of one object per guest.
+    Columns are plain `array`s, numpy can wrap them without a copy
+    (np.frombuffer(batch.day_in, dtype=batch.day_in.typecode)).
+    """
+    __slots__ = ('day_in', 'day_out', 'room_preferences', 'discount', 'arrival_hour')
+
+    TYPECODES = {
+        'day_in': 'i',
+        'day_out': 'i',
+        'room_preferences': 'b',
+        'discount': 'h',
+        'arrival_hour': 'q',
+    }
+
+    def __init__(
+        self,
+        day_in: tp.Iterable[int] = (),
+        day_out: tp.Iterable[int] = (),
+        room_preferences: tp.Iterable[int] = (),
+        discount: tp.Optional[tp.Iterable[int]] = None,
+        arrival_hour: tp.Optional[tp.Iterable[int]] = None,
+    ):
+        self.day_in = _column(self.TYPECODES['day_in'], day_in)
+        self.day_out = _column(self.TYPECODES['day_out'], day_out)
+        self.room_preferences = _column(self.TYPECODES['room_preferences'], room_preferences)
+        size = len(self.day_in)
+        self.discount = _column(self.TYPECODES['discount'], [0] * size if discount is None else discount)
+        self.arrival_hour = _column(self.TYPECODES['arrival_hour'], [0] * size if arrival_hour is None else arrival_hour)
+        if not all(len(getattr(self, name)) == size for name in self.__slots__):
+            raise ValueError('all GuestBatch columns must have the same length')
+
+    @classmethod
+    def from_guests(cls, guests: tp.Iterable[Guest], arrival_hours: tp.Optional[tp.Iterable[int]] = None) -> 'GuestBatch':
+        batch = cls()
+        arrival_hours = iter(arrival_hours) if arrival_hours is not None else None
+        for guest in guests:
+            batch.append(guest, next(arrival_hours) if arrival_hours is not None else 0)
+        return batch
+
+    @classmethod
+    def concat(cls, batches: tp.Sequence['GuestBatch']) -> 'GuestBatch':
+        if len(batches) == 1:
+            return batches[0]
+        batch = cls()
+        for other in batches:
+            for name in cls.__slots__:
+                getattr(batch, name).extend(getattr(other, name))
+        return batch
+
+    def append(self, guest: tp.Union[Guest, GuestView], arrival_hour: int = 0):
+        self.day_in.append(guest.day_in)
+        self.day_out.append(guest.day_out)
+        self.room_preferences.append(guest.room_preferences)
+        self.discount.append(guest.discount)
+        self.arrival_hour.append(arrival_hour)
+
+    def to_guests(self) -> tp.List[Guest]:
+        return [view.to_guest() for view in self]
+
+    def __len__(self) -> int:
+        return len(self.day_in)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            batch = GuestBatch.__new__(GuestBatch)
+            for name in self.__slots__:
+                setattr(batch, name, getattr(self, name)[index])
+            return batch
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('GuestBatch index out of range')
+        return GuestView(self, index)
+
+    def __iter__(self) -> tp.Iterator[GuestView]:
+        return (GuestView(self, index) for index in range(len(self)))
+
+    def __repr__(self) -> str:
+        return f'GuestBatch({len(self)} guests)'
+
+
+def _column(typecode: str, values) -> array:
+    if hasattr(values, 'astype'): # numpy array, numpy understands array typecodes
+        column = array(typecode)
+        column.frombytes(values.astype(typecode).tobytes())
+        return column
+    return array(typecode, values)
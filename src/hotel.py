@@ -1,9 +1,35 @@
+import heapq
+import logging
 import typing as tp
 
-from src.guest import Guest
+from src.guest import Guest, GuestBatch
+from src.occupancy import CategoryIndex, OccupancyWindow, RoomDaysSum, iter_bits
+from src.perf import ADMISSION, HOTEL_TICK, PerfStats
 from src.room import Room
+from src.trace import BOOKED, DEPARTED, LOST, TraceWriter
 from src.utils import logger, HOURS_PER_DAY
 
+SINGLE, DOUBLE, JUNIOR, LUXURY = range(4)
+CATEGORY_NAMES = {
+    SINGLE: 'single',
+    DOUBLE: 'double',
+    JUNIOR: 'junior',
+    LUXURY: 'luxury',
+}
+# categories offered with discount when the preferred one is full
+DISCOUNT_FALLBACKS = {
+    SINGLE: (DOUBLE, JUNIOR, LUXURY),
+    DOUBLE: (JUNIOR, LUXURY),
+    JUNIOR: (LUXURY,),
+}
+
+# how a room is chosen among free ones
+FIRST_FIT = 'first_fit' # room with the lowest number, the original behaviour
+BEST_FIT = 'best_fit' # room with the shortest free gap around the stay
+ROOM_CHOICES = (FIRST_FIT, BEST_FIT)
+
+WEEK_WINDOW_DAYS = 8 # the "week" of per_week_* properties is today and 7 days ahead
+
 def occupation_str(occupation_dict):
     # Convert the dictionary keys to a sorted list of integers
     days = sorted(list(occupation_dict.keys()))
@@ -50,6 +76,11 @@ def occupation_str(occupation_dict):
 
     return sequence
 
+
+def _arrival_hour(guest: Guest, default: int) -> int:
+    """Hour the guest arrived at, plain Guest objects do not carry it"""
+    return getattr(guest, 'arrival_hour', default)
+
 class Hotel:
     def __init__(
         self,
@@ -62,27 +93,51 @@ class Hotel:
         number_of_single_rooms: int,
         cost_of_single_rooms: int,
         discount_percent: int,
+        room_choice: str = FIRST_FIT,
+        occupation_windows: tp.Iterable[int] = (),
+        trace: tp.Optional[TraceWriter] = None,
+        legacy_fallback: bool = False,
     ):
+        if room_choice not in ROOM_CHOICES:
+            raise ValueError(f'room_choice must be one of {ROOM_CHOICES}, got {room_choice!r}')
         
-        self._luxury_rooms: tp.List[Room] = [
-            Room(price=cost_of_luxury_rooms)
-            for _ in range(number_of_luxury_rooms)
-        ]
-        self._junior_suites: tp.List[Room] = [
-            Room(price=cost_of_junior_suites)
-            for _ in range(number_of_junior_suites)
-        ]
-        self._double_rooms: tp.List[Room] = [
-            Room(price=cost_of_double_rooms)
-            for _ in range(number_of_double_rooms)
-        ]
-        self._single_rooms: tp.List[Room] = [
-            Room(price=cost_of_single_rooms)
-            for _ in range(number_of_single_rooms)
-        ]
+        self._number_of_rooms: tp.Dict[int, int] = {
+            SINGLE: number_of_single_rooms,
+            DOUBLE: number_of_double_rooms,
+            JUNIOR: number_of_junior_suites,
+            LUXURY: number_of_luxury_rooms,
+        }
+        self._room_choice = room_choice
+        self._costs: tp.Dict[int, int] = {
+            SINGLE: cost_of_single_rooms,
+            DOUBLE: cost_of_double_rooms,
+            JUNIOR: cost_of_junior_suites,
+            LUXURY: cost_of_luxury_rooms,
+        }
+        self._create_rooms(self._costs)
+
+        # (day_out, category, room_id) of every booking, guests leave in day_out order;
+        # with a trace (day_out, category, room_id, guest_id, day_in, price)
+        self._departures: tp.List[tp.Tuple] = []
+        self._trace = trace
+        self._received_guests = 0 # guest ids in the trace, in arrival order
 
         self._discount_percent = discount_percent
+        # book every fallback category that has a room, as the model did before
+        self._legacy_fallback = legacy_fallback
         self._total_lost_clients = 0
+        # running statistics per category, updated on bookings and departures
+        self._earnings: tp.List[float] = [0.0] * len(CATEGORY_NAMES)
+        self._served_guests: tp.List[int] = [0] * len(CATEGORY_NAMES)
+        self._occupied_room_days: tp.List[int] = [0] * len(CATEGORY_NAMES)
+        self._lost_clients: tp.List[int] = [0] * len(CATEGORY_NAMES)
+        self._room_days: tp.List[RoomDaysSum] = [RoomDaysSum() for _ in CATEGORY_NAMES]
+        # rolling occupancy windows by length, one window per category
+        self._windows: tp.Dict[int, tp.List[OccupancyWindow]] = {
+            length: [OccupancyWindow(room_days, length) for room_days in self._room_days]
+            for length in sorted({WEEK_WINDOW_DAYS, *occupation_windows})
+        }
+        self._total_served_guests = 0
         self._current_day_hours = 0 # hours from start. day = _current_day_hours / HOURS_PER_DAY
 
         logger.debug(f'Created Hotel with '
@@ -92,283 +147,323 @@ class Hotel:
                      f'{number_of_single_rooms} single rooms(cost={cost_of_single_rooms}), '
                      f'dicount percent = {discount_percent}')
         
-    def recieve_guests(self, guests: tp.List[Guest]):
+    def recieve_guests(self, guests: tp.Union[tp.Sequence[Guest], GuestBatch]):
         """Book for guest some room or add to lost clients"""
         for guest in guests:
-            guest_room_id = -1
-            if guest.room_preferences == 0:
-                for room_id in range(len(self._single_rooms)):
-                    if self._single_rooms[room_id].receive_guest(guest):
-                        guest_room_id = room_id
-                        logger.debug(f'the client {guest} checked into the single room {guest_room_id}')
-                        break
-            elif guest.room_preferences == 1:
-                for room_id in range(len(self._double_rooms)):
-                    if self._double_rooms[room_id].receive_guest(guest):
-                        guest_room_id = room_id
-                        logger.debug(f'the client {guest} checked into the double room {guest_room_id}')
-                        break
-            if guest.room_preferences == 2:
-                for room_id in range(len(self._junior_suites)):
-                    if self._junior_suites[room_id].receive_guest(guest):
-                        guest_room_id = room_id
-                        logger.debug(f'the client {guest} checked into the junior suites {guest_room_id}')
-                        break
-            elif guest.room_preferences == 3:
-                for room_id in range(len(self._luxury_rooms)):
-                    if self._luxury_rooms[room_id].receive_guest(guest):
-                        guest_room_id = room_id
-                        logger.debug(f'the client {guest} checked into the luxury room {guest_room_id}')
-                        break
-            
-            if guest_room_id == -1 and (guest.room_preferences == 0 or guest.room_preferences == 1):
-                guest.add_discount(self._discount_percent)
+            self._receive_guest(guest)
 
-                for room_id in range(len(self._double_rooms)):
-                    if self._double_rooms[room_id].receive_guest(guest):
-                        guest_room_id = room_id
-                        logger.debug(f'the client {guest} checked into the double room {guest_room_id} with discount {self._discount_percent}')
-                        break
-                for room_id in range(len(self._junior_suites)):
-                    if self._junior_suites[room_id].receive_guest(guest):
-                        guest_room_id = room_id
-                        logger.debug(f'the client {guest} checked into junior suites {guest_room_id} with discount {self._discount_percent}')
-                        break
-                for room_id in range(len(self._luxury_rooms)):
-                    if self._luxury_rooms[room_id].receive_guest(guest):
-                        guest_room_id = room_id
-                        logger.debug(f'the client {guest} checked into the luxury room {guest_room_id} with discount {self._discount_percent}')
-                        break
-            elif guest_room_id == -1 and guest.room_preferences == 2:
-                guest.add_discount(self._discount_percent)
-                for room_id in range(len(self._luxury_rooms)):
-                    if self._luxury_rooms[room_id].receive_guest(guest):
-                        guest_room_id = room_id
-                        logger.debug(f'the client {guest} checked into the luxury room {guest_room_id} with discount {self._discount_percent}')
+    def admit_guests(self, guests: tp.Union[tp.Sequence[Guest], GuestBatch]) -> tp.List[int]:
+        """Receive guests as recieve_guests does, return the day_out of every booked one"""
+        return [guest.day_out for guest in guests if self._receive_guest(guest)]
+
+    def instrument(self, perf: PerfStats):
+        """Time admission and ticks and count room searches of this hotel into perf"""
+        self.recieve_guests = perf.timed(ADMISSION, self.recieve_guests)
+        self.admit_guests = perf.timed(ADMISSION, self.admit_guests)
+        self.tick = perf.timed(HOTEL_TICK, self.tick)
+        self._find_room = perf.counted_probes(self._find_room)
+
+    def _receive_guest(self, guest: Guest) -> bool:
+        """Book a room for the guest, return False for a lost client"""
+        self._received_guests += 1
+        guest_room_id = self._check_in(guest, guest.room_preferences)
+
+        fallback_categories = DISCOUNT_FALLBACKS.get(guest.room_preferences, ())
+        if guest_room_id == -1 and fallback_categories:
+            guest.add_discount(self._discount_percent)
+            for category in fallback_categories:
+                room_id = self._check_in(guest, category)
+                if room_id != -1:
+                    guest_room_id = room_id
+                    if not self._legacy_fallback:
                         break
 
-            if guest_room_id == -1:
-                    self._total_lost_clients += 1
-                    logger.debug(f'lost a client with room preferences {guest.room_preferences}')
+        if guest_room_id == -1:
+            self._total_lost_clients += 1
+            if guest.room_preferences in CATEGORY_NAMES:
+                self._lost_clients[guest.room_preferences] += 1
+            if self._trace is not None:
+                self._trace.record(
+                    _arrival_hour(guest, self._current_day_hours), self._received_guests - 1, guest.room_preferences, -1,
+                    guest.day_in, guest.day_out, 0.0, LOST,
+                )
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f'lost a client with room preferences {guest.room_preferences}')
+            return False
+        return True
+
+    def _create_rooms(self, costs: tp.Dict[int, int]):
+        """Build room storage, one Room object per room"""
+        self._rooms_by_category: tp.Dict[int, tp.List[Room]] = {
+            category: [Room(price=costs[category]) for _ in range(number_of_rooms)]
+            for category, number_of_rooms in self._number_of_rooms.items()
+        }
+        self._category_indexes: tp.Dict[int, CategoryIndex] = {
+            category: CategoryIndex(number_of_rooms)
+            for category, number_of_rooms in self._number_of_rooms.items()
+        }
+
+    def _find_room(self, category: int, day_in: int, day_out: int) -> int:
+        """Room id in category free for the stay or -1"""
+        index = self._category_indexes[category]
+        if self._room_choice == FIRST_FIT:
+            return index.first_free_room(day_in, day_out)
+
+        rooms = self._rooms_by_category[category]
+        best_room_id, best_gap = -1, 0
+        for room_id in iter_bits(index.free_rooms(day_in, day_out)):
+            gap = rooms[room_id].free_gap_length(day_in, day_out)
+            if best_room_id == -1 or gap < best_gap:
+                best_room_id, best_gap = room_id, gap
+        return best_room_id
+
+    def _check_in(self, guest: Guest, category: int) -> int:
+        """Put guest into a free room of category, return room id or -1"""
+        if category not in CATEGORY_NAMES:
+            return -1
+        room_id = self._find_room(category, guest.day_in, guest.day_out)
+        if room_id == -1:
+            return -1
+
+        self._earnings[category] += self._book_room(category, room_id, guest)
+        self._occupied_room_days[category] += guest.day_out - guest.day_in + 1
+        self._room_days[category].add(guest.day_in, guest.day_out)
+        for windows in self._windows.values():
+            windows[category].add(guest.day_in, guest.day_out)
+        if self._trace is None:
+            heapq.heappush(self._departures, (guest.day_out, category, room_id))
+        else:
+            guest_id = self._received_guests - 1
+            price = self._costs[category] * (1 - guest.discount/100)
+            self._trace.record(
+                _arrival_hour(guest, self._current_day_hours), guest_id, category, room_id,
+                guest.day_in, guest.day_out, price, BOOKED,
+            )
+            heapq.heappush(self._departures, (guest.day_out, category, room_id, guest_id, guest.day_in, price))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'the client {guest} checked into the {CATEGORY_NAMES[category]} room {room_id}'
+                         f' with discount {guest.discount}')
+        return room_id
+
+    def _book_room(self, category: int, room_id: int, guest: Guest) -> float:
+        """Occupy the room for the stay, return how the category earnings grow"""
+        room = self._rooms_by_category[category][room_id]
+        earnings_before = room.total_earnings
+        if not room.receive_guest(guest):
+            raise RuntimeError(f'{CATEGORY_NAMES[category]} room {room_id} is free in the index but busy in the room')
+        self._category_indexes[category].occupy(room_id, guest.day_in, guest.day_out)
+        return room.total_earnings - earnings_before
+
+    def _check_out_room(self, category: int, room_id: int, day: int) -> int:
+        """Serve guests leaving the room up to the day, return how many left"""
+        return self._rooms_by_category[category][room_id].check_out(day)
+
+    def _occupancy_today(self, category: int) -> tp.List[bool]:
+        day = self._current_day_hours // HOURS_PER_DAY
+        return [room.is_occupied(day) for room in self._rooms_by_category[category]]
+
+    def _occupancy_in_week(self, category: int) -> tp.List[tp.Dict[int, bool]]:
+        day = self._current_day_hours // HOURS_PER_DAY
+        return [room.current_occupation_in_week(day) for room in self._rooms_by_category[category]]
         
+    @property
+    def current_hour(self) -> int:
+        return self._current_day_hours
+
     def tick(self, tick_hours: int):
         logger.debug('Hotel tick')
         self._current_day_hours = self._current_day_hours + tick_hours
-        for room_number in range(len(self._single_rooms)):
-            logger.debug(f"Tick in single room #{room_number}")
-            self._single_rooms[room_number].tick(self._current_day_hours // HOURS_PER_DAY)
-        for room_number in range(len(self._double_rooms)):
-            logger.debug(f"Tick in double room #{room_number}")
-            self._double_rooms[room_number].tick(self._current_day_hours // HOURS_PER_DAY)
-        for room_number in range(len(self._junior_suites)):
-            logger.debug(f"Tick in junior room #{room_number}")
-            self._junior_suites[room_number].tick(self._current_day_hours // HOURS_PER_DAY)
-        for room_number in range(len(self._luxury_rooms)):
-            logger.debug(f"Tick in luxury room #{room_number}")
-            self._luxury_rooms[room_number].tick(self._current_day_hours // HOURS_PER_DAY)
+        day = self._current_day_hours // HOURS_PER_DAY
+        departures = self._departures
+        while departures and departures[0][0] <= day:
+            departure = heapq.heappop(departures)
+            category, room_id = departure[1], departure[2]
+            if self._trace is not None:
+                day_out, _, _, guest_id, day_in, price = departure
+                self._trace.record(
+                    day_out * HOURS_PER_DAY, guest_id, category, room_id, day_in, day_out, price, DEPARTED,
+                )
+            served_guests = self._check_out_room(category, room_id, day)
+            self._served_guests[category] += served_guests
+            self._total_served_guests += served_guests
+        for windows in self._windows.values():
+            for window in windows:
+                window.advance(day)
             
     
     @property
     def current_luxury_occupancy_str(self) -> tp.List[str]:
-        return [occupation_str(room.current_occupation_in_week(self._current_day_hours // HOURS_PER_DAY)) for room in self._luxury_rooms]
+        return [occupation_str(occupation) for occupation in self._occupancy_in_week(LUXURY)]
     
     @property
     def current_junior_occupancy_str(self) -> tp.List[str]:
-        return [occupation_str(room.current_occupation_in_week(self._current_day_hours // HOURS_PER_DAY)) for room in self._luxury_rooms]
+        return [occupation_str(occupation) for occupation in self._occupancy_in_week(JUNIOR)]
     
     @property
     def current_double_occupancy_str(self) -> tp.List[str]:
-        return [occupation_str(room.current_occupation_in_week(self._current_day_hours // HOURS_PER_DAY)) for room in self._luxury_rooms]
+        return [occupation_str(occupation) for occupation in self._occupancy_in_week(DOUBLE)]
     
     @property
     def current_single_occupancy_str(self) -> tp.List[str]:
-        return [occupation_str(room.current_occupation_in_week(self._current_day_hours // HOURS_PER_DAY)) for room in self._luxury_rooms]
+        return [occupation_str(occupation) for occupation in self._occupancy_in_week(SINGLE)]
     
 
     @property
     def current_luxury_occupancy_today(self) -> tp.List[bool]:
-        return [room.is_occupied(self._current_day_hours // HOURS_PER_DAY) for room in self._luxury_rooms]
+        return self._occupancy_today(LUXURY)
     
     @property
     def current_junior_occupancy_today(self) -> tp.List[bool]:
-        return [room.is_occupied(self._current_day_hours // HOURS_PER_DAY) for room in self._junior_suites]
+        return self._occupancy_today(JUNIOR)
     
     @property
     def current_double_occupancy_today(self) -> tp.List[bool]:
-        return [room.is_occupied(self._current_day_hours // HOURS_PER_DAY) for room in self._double_rooms]
+        return self._occupancy_today(DOUBLE)
     
     @property
     def current_single_occupancy_today(self) -> tp.List[bool]:
-        return [room.is_occupied(self._current_day_hours // HOURS_PER_DAY) for room in self._single_rooms]
+        return self._occupancy_today(SINGLE)
     
     
+    def window_occupation_percent(self, length: int, category: tp.Optional[int] = None) -> int:
+        """
+        Average room occupation over today and the next length-1 days
+        for a category or the whole hotel.
+        Windows passed as occupation_windows are O(1), others are counted on demand.
+        """
+        categories = tuple(CATEGORY_NAMES) if category is None else (category,)
+        if length in self._windows:
+            occup_days = sum(self._windows[length][category].occupied for category in categories)
+        else:
+            day = self._current_day_hours // HOURS_PER_DAY
+            occup_days = sum(self._room_days[category].total(day, day+length-1) for category in categories)
+        number_of_rooms = sum(self._number_of_rooms[category] for category in categories)
+        avg_occupation = float(occup_days) / length
+        avg_occupation /= number_of_rooms
+        return int(avg_occupation*100)
+    
     @property
     def per_week_luxury_occupation_percent(self) -> int:
-        avg_occupation = 0
-        for room in self._luxury_rooms:
-            day=self._current_day_hours // HOURS_PER_DAY
-            occupation = room.current_occupation_in_week(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(self._luxury_rooms)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self.window_occupation_percent(WEEK_WINDOW_DAYS, LUXURY)
     
     @property
     def per_week_junior_occupation_percent(self) -> int:
-        avg_occupation = 0
-        for room in self._junior_suites:
-            day=self._current_day_hours // HOURS_PER_DAY
-            occupation = room.current_occupation_in_week(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(self._junior_suites)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self.window_occupation_percent(WEEK_WINDOW_DAYS, JUNIOR)
     
     @property
     def per_week_double_occupation_percent(self) -> int:
-        avg_occupation = 0
-        for room in self._double_rooms:
-            day=self._current_day_hours // HOURS_PER_DAY
-            occupation = room.current_occupation_in_week(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(self._double_rooms)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self.window_occupation_percent(WEEK_WINDOW_DAYS, DOUBLE)
     
     @property
     def per_week_single_occupation_percent(self) -> int:
-        avg_occupation = 0
-        for room in self._single_rooms:
-            day=self._current_day_hours // HOURS_PER_DAY
-            occupation = room.current_occupation_in_week(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(self._single_rooms)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self.window_occupation_percent(WEEK_WINDOW_DAYS, SINGLE)
     
     @property
     def per_week_hotel_occupation_percent(self) -> int:
-        avg_occupation = 0
-        all_rooms = self._single_rooms + self._double_rooms + self._junior_suites + self._luxury_rooms
-        for room in all_rooms:
-            day=self._current_day_hours // HOURS_PER_DAY
-            occupation = room.current_occupation_in_week(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(all_rooms)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self.window_occupation_percent(WEEK_WINDOW_DAYS)
+    
     
+    def _total_occupation_percent(self, categories: tp.Iterable[int], day: int) -> int:
+        """Average room occupation over days [0, day], in 8-day weeks as before"""
+        occup_days = sum(self._room_days[category].prefix(day) for category in categories)
+        number_of_rooms = sum(self._number_of_rooms[category] for category in categories)
+        avg_occupation = float(occup_days) / 8
+        avg_occupation /= number_of_rooms
+        return int(avg_occupation*100)
     
     def total_luxury_occupation_percent(self, day) -> int:
-        avg_occupation = 0
-        for room in self._luxury_rooms:
-            occupation = room.occupation_in_model(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(self._luxury_rooms)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self._total_occupation_percent((LUXURY,), day)
     
     def total_junior_occupation_percent(self, day) -> int:
-        avg_occupation = 0
-        for room in self._junior_suites:
-            occupation = room.occupation_in_model(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(self._junior_suites)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self._total_occupation_percent((JUNIOR,), day)
     
     def total_double_occupation_percent(self, day) -> int:
-        avg_occupation = 0
-        for room in self._double_rooms:
-            occupation = room.occupation_in_model(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(self._double_rooms)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self._total_occupation_percent((DOUBLE,), day)
     
     def total_single_occupation_percent(self, day) -> int:
-        avg_occupation = 0
-        for room in self._single_rooms:
-            occupation = room.occupation_in_model(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(self._single_rooms)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self._total_occupation_percent((SINGLE,), day)
     
     def total_hotel_occupation_percent(self, day) -> int:
-        avg_occupation = 0
-        all_rooms = self._single_rooms + self._double_rooms + self._junior_suites + self._luxury_rooms
-        for room in all_rooms:
-            occupation = room.occupation_in_model(day)
-            occup_days = sum(occupation.values())
-            avg_occupation += float(occup_days) / 8
-        avg_occupation /= len(all_rooms)
-        avg_occupation = int(avg_occupation*100)
-        return avg_occupation
+        return self._total_occupation_percent(CATEGORY_NAMES, day)
+
+
+    def daily_occupation(self, first: int, last: int, category: tp.Optional[int] = None) -> tp.List[float]:
+        """Share of occupied rooms on every day of [first, last]"""
+        categories = tuple(CATEGORY_NAMES) if category is None else (category,)
+        number_of_rooms = sum(self._number_of_rooms[category] for category in categories)
+        return [
+            sum(self._room_days[category].on_day(day) for category in categories) / number_of_rooms
+            for day in range(first, last + 1)
+        ]
+
+    def occupation_percent_between(self, first: int, last: int, category: tp.Optional[int] = None) -> float:
+        """Average room occupation over days [first, last] in percent"""
+        categories = tuple(CATEGORY_NAMES) if category is None else (category,)
+        occup_days = sum(self._room_days[category].total(first, last) for category in categories)
+        number_of_rooms = sum(self._number_of_rooms[category] for category in categories)
+        return occup_days / (last - first + 1) / number_of_rooms * 100
 
 
     @property
     def current_luxury_total_earnings(self):
-        return round(sum((room.total_earnings for room in self._luxury_rooms)), 1)
+        return round(self._earnings[LUXURY], 1)
 
     @property
     def current_junior_total_earnings(self):
-        return round(sum((room.total_earnings for room in self._junior_suites)), 1)
+        return round(self._earnings[JUNIOR], 1)
     
     @property
     def current_double_total_earnings(self):
-        return round(sum((room.total_earnings for room in self._double_rooms)), 1)
+        return round(self._earnings[DOUBLE], 1)
     
     @property
     def current_single_total_earnings(self):
-        return round(sum((room.total_earnings for room in self._single_rooms)), 1)
+        return round(self._earnings[SINGLE], 1)
     
     @property
     def current_hotel_total_earnings(self):
-        all_rooms = self._luxury_rooms + self._junior_suites + self._double_rooms + self._single_rooms
-        return round(sum((room.total_earnings for room in all_rooms)), 1)
+        return round(sum(self._earnings), 1)
     
 
     @property
     def luxury_served_guests(self):
-        return int(sum((room.total_served_guests for room in self._luxury_rooms)))
+        return self._served_guests[LUXURY]
     
     @property
     def junior_served_guests(self):
-        return int(sum((room.total_served_guests for room in self._junior_suites)))
+        return self._served_guests[JUNIOR]
     
     @property
     def double_served_guests(self):
-        return int(sum((room.total_served_guests for room in self._double_rooms)))
+        return self._served_guests[DOUBLE]
     
     @property
     def single_served_guests(self):
-        return int(sum((room.total_earnings for room in self._single_rooms)))
+        return self._served_guests[SINGLE]
     
     @property
     def hotel_served_guests(self):
-        all_rooms = self._luxury_rooms + self._junior_suites + self._double_rooms + self._single_rooms
-        return int(sum((room.total_served_guests for room in all_rooms)))
+        return self._total_served_guests
 
 
     @property
     def total_lost_clients(self):
         return self._total_lost_clients
     
+    @property
+    def lost_clients_by_category(self) -> tp.Dict[str, int]:
+        """Lost clients by the category they asked for"""
+        return {name: self._lost_clients[category] for category, name in CATEGORY_NAMES.items()}
+    
+    @property
+    def occupied_room_days_by_category(self) -> tp.Dict[str, int]:
+        """Room-days booked so far in every category"""
+        return {name: self._occupied_room_days[category] for category, name in CATEGORY_NAMES.items()}
+    
 
     @property
     def percent_of_surved_clients(self):
-        all_rooms = self._luxury_rooms + self._junior_suites + self._double_rooms + self._single_rooms
-        surved_clients = float(sum((room.total_served_guests for room in all_rooms)))
+        surved_clients = float(self._total_served_guests)
         lost_clients = self._total_lost_clients 
         all_clients = surved_clients + lost_clients
         if all_clients == 0:
@@ -1,43 +1,156 @@
+import bisect
+import logging
 import random
 import sys
 import typing as tp
 
-from src.guest import Guest
-from src.hotel import Hotel
+from src.guest import Guest, GuestBatch
+from src.hotel import DOUBLE, FIRST_FIT, JUNIOR, LUXURY, SINGLE, Hotel
+from src.perf import DRAIN, KPI_READS, PerfStats
+from src.seeding import Seed, python_random, resolve_seed
+from src.trace import TraceWriter
+from src.warmup import mser
 from src.utils import (
     logger,
     HOURS_PER_DAY,
 )
 
-def _generate_customers(modeling_days: int, new_application_hours: tp.Tuple[int, int]) -> tp.List[tp.Union[Guest, int]]:
+OBJECT_ENGINE = 'object' # Room objects, the reference engine
+TABLE_ENGINE = 'table' # NumPy room table, needs numpy
+ENGINES = (OBJECT_ENGINE, TABLE_ENGINE)
+
+
+def _hotel_class(engine: str) -> tp.Type[Hotel]:
+    if engine == OBJECT_ENGINE:
+        return Hotel
+    if engine == TABLE_ENGINE:
+        from src.room_table import RoomTableHotel # numpy is only needed by this engine
+        return RoomTableHotel
+    raise ValueError(f'engine must be one of {ENGINES}, got {engine!r}')
+
+PYTHON_ARRIVALS = 'python' # guest by guest from random.Random, the reference generator
+NUMPY_ARRIVALS = 'numpy' # vectorized chunks from a numpy Generator, needs numpy
+ARRIVAL_GENERATORS = (PYTHON_ARRIVALS, NUMPY_ARRIVALS)
+ARRIVALS_BATCH_SIZE = 1024 # guests the python generator puts into one GuestBatch
+
+# HotelModel properties making up a statistics snapshot
+STATISTICS = (
+    'per_week_luxury_occupation_percent',
+    'per_week_junior_occupation_percent',
+    'per_week_double_occupation_percent',
+    'per_week_single_occupation_percent',
+    'per_week_hotel_occupation_percent',
+    'total_luxury_occupation_percent',
+    'total_junior_occupation_percent',
+    'total_double_occupation_percent',
+    'total_single_occupation_percent',
+    'total_hotel_occupation_percent',
+    'current_luxury_total_earnings',
+    'current_junior_total_earnings',
+    'current_double_total_earnings',
+    'current_single_total_earnings',
+    'current_hotel_total_earnings',
+    'luxury_served_guests',
+    'junior_served_guests',
+    'double_served_guests',
+    'single_served_guests',
+    'hotel_served_guests',
+    'total_lost_clients',
+    'percent_of_surved_clients',
+)
+# added to the snapshot by steady_state=True: the MSER-5 warm-up of the hotel
+# occupancy and the occupation averaged over the finished days after it
+STEADY_STATE_STATISTICS = (
+    'steady_state_warmup_days',
+    'steady_state_luxury_occupation_percent',
+    'steady_state_junior_occupation_percent',
+    'steady_state_double_occupation_percent',
+    'steady_state_single_occupation_percent',
+    'steady_state_hotel_occupation_percent',
+)
+# every KPI a snapshot can have, STATISTICS stay first so record indexes hold for both
+ALL_STATISTICS = STATISTICS + STEADY_STATE_STATISTICS
+STEADY_STATE_CATEGORIES = (
+    ('luxury', LUXURY),
+    ('junior', JUNIOR),
+    ('double', DOUBLE),
+    ('single', SINGLE),
+    ('hotel', None),
+)
+
+
+def statistics_names(steady_state: bool = False) -> tp.Tuple[str, ...]:
+    """KPIs of a statistics snapshot in order"""
+    return ALL_STATISTICS if steady_state else STATISTICS
+
+
+def _generate_customers(
+    modeling_days: int,
+    new_application_hours: tp.Tuple[int, int],
+    rng: random.Random,
+) -> tp.Iterator[tp.Tuple[Guest, int]]:
     """
     Generate customers with given random parameters.
+    Customers are produced lazily as (guest, arrival hour) in arrival order,
+    so memory does not depend on the modeling horizon.
     """
     MIN_LIFE_EXPECTANCY = 1 # срок жизни в номере
     MAX_LIFE_EXPECTANCY = 7
     MIN_FURTHEST_BOOKING_DAY = 0 # не дальше какого дня бронь
     MAX_FURTHEST_BOOKING_DAY = 6
     current_hour = 0
-    generated_customers = []
     while current_hour < modeling_days * HOURS_PER_DAY:
-        if random.randint(0,1) == 1: # заселение в моменте
+        if rng.randint(0,1) == 1: # заселение в моменте
             day_in = current_hour // HOURS_PER_DAY
         else: # бронь с предоплатой
-            day_in = random.randint(MIN_FURTHEST_BOOKING_DAY, MAX_FURTHEST_BOOKING_DAY)
-        day_out = day_in + random.randint(MIN_LIFE_EXPECTANCY, MAX_LIFE_EXPECTANCY)
+            day_in = rng.randint(MIN_FURTHEST_BOOKING_DAY, MAX_FURTHEST_BOOKING_DAY)
+        day_out = day_in + rng.randint(MIN_LIFE_EXPECTANCY, MAX_LIFE_EXPECTANCY)
         
-        generated_customers.append(
-            (
-                Guest(
-                    day_in=day_in,
-                    day_out=day_out,
-                    room_preferences = random.randint(0, 3), 
-                    discount=0), 
-                current_hour
-            )
+        yield (
+            Guest(
+                day_in=day_in,
+                day_out=day_out,
+                room_preferences = rng.randint(0, 3), 
+                discount=0), 
+            current_hour
         )
-        current_hour += random.randint(*new_application_hours)
-    return generated_customers
+        current_hour += rng.randint(*new_application_hours)
+
+def _guest_batches(flow: tp.Iterable[tp.Tuple[Guest, int]], batch_size: int) -> tp.Iterator[GuestBatch]:
+    batch = GuestBatch()
+    for guest, arrival_hour in flow:
+        batch.append(guest, arrival_hour)
+        if len(batch) == batch_size:
+            yield batch
+            batch = GuestBatch()
+    if len(batch):
+        yield batch
+
+def _arrivals(
+    generator: str,
+    modeling_days: int,
+    new_application_hours: tp.Tuple[int, int],
+    seed: Seed,
+    antithetic: bool = False,
+) -> tp.Iterator[GuestBatch]:
+    """Arrivals as GuestBatch chunks in arrival order, drawn from a generator owned by the flow"""
+    if antithetic and generator != NUMPY_ARRIVALS:
+        # _generate_customers skips the booking day draw for walk-ins, a mirrored stream would lose step
+        raise ValueError(f'antithetic arrivals need arrivals={NUMPY_ARRIVALS!r}')
+    if generator == PYTHON_ARRIVALS:
+        flow = _generate_customers(modeling_days, new_application_hours, python_random(seed))
+        return _guest_batches(flow, ARRIVALS_BATCH_SIZE)
+    if generator == NUMPY_ARRIVALS:
+        import numpy as np # numpy is only needed by this generator
+        from src.arrivals import generate_arrival_columns
+        return generate_arrival_columns(
+            modeling_days,
+            new_application_hours,
+            np.random.default_rng(seed),
+            antithetic=antithetic,
+        )
+    raise ValueError(f'arrivals must be one of {ARRIVAL_GENERATORS}, got {generator!r}')
+
 
 class HotelModel:
     
@@ -55,8 +168,18 @@ class HotelModel:
         new_application_hours: tp.Tuple[int, int],
         discount_percent: int,
         tick_hours: int,
+        room_choice: str = FIRST_FIT,
+        occupation_windows: tp.Iterable[int] = (),
+        engine: str = OBJECT_ENGINE,
+        arrivals: str = PYTHON_ARRIVALS,
+        seed: tp.Optional[Seed] = None,
+        antithetic: bool = False,
+        trace: tp.Optional[TraceWriter] = None,
+        instrument: bool = False,
+        legacy_fallback: bool = False,
+        steady_state: bool = False,
     ):
-        self._hotel = Hotel(
+        self._hotel = _hotel_class(engine)(
             number_of_luxury_rooms=model_number_of_luxury_rooms,
             cost_of_luxury_rooms=model_cost_of_luxury_rooms,
             number_of_junior_suites=model_number_of_junior_suites,
@@ -65,12 +188,26 @@ class HotelModel:
             cost_of_double_rooms=model_cost_of_double_rooms,
             number_of_single_rooms=model_number_of_single_rooms,
             cost_of_single_rooms=model_cost_of_single_rooms,
-            discount_percent=discount_percent
+            discount_percent=discount_percent,
+            room_choice=room_choice,
+            occupation_windows=occupation_windows,
+            trace=trace,
+            legacy_fallback=legacy_fallback,
         )
         self._modeling_days = modeling_days
         self._tick_hours = tick_hours
+        self._steady_state = steady_state
         self._current_tick = 0
-        self._guests_flow = _generate_customers(modeling_days, new_application_hours)
+        self._seed = resolve_seed(seed)
+        self._guests_flow = _arrivals(arrivals, modeling_days, new_application_hours, self._seed, antithetic)
+        self._pending_guests = GuestBatch() # arrivals generated but not received yet
+        self._pending_start = 0
+        self._perf: tp.Optional[PerfStats] = None
+        if instrument:
+            self._perf = PerfStats()
+            self._take_arrivals = self._perf.timed(DRAIN, self._perf.counted_arrivals(self._take_arrivals))
+            self.statistics = self._perf.timed(KPI_READS, self.statistics)
+            self._hotel.instrument(self._perf)
         logger.debug(f"Model with parameters: tick_time={self._tick_hours}")
 
     def tick(self):
@@ -79,15 +216,135 @@ class HotelModel:
         get new guests from generated.
         Then makes hotel tick.
         """
-        new_customers = []
-        while self._guests_flow and (self._current_tick+1) * self._tick_hours >= self._guests_flow[0][1]:
-            new_guest = self._guests_flow.pop(0)
-            new_customers.append(new_guest[0])
+        new_customers = self._take_arrivals((self._current_tick+1) * self._tick_hours)
 
-        logger.debug(f'TICK# {self._current_tick + 1}: generated_customers = {new_customers}')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'TICK# {self._current_tick + 1}: generated_customers = {new_customers}')
         self._hotel.recieve_guests(new_customers)
         self._hotel.tick(self._tick_hours)
         self._current_tick += 1
+
+    def advance(self, n_ticks: int) -> tp.Dict[str, tp.Union[int, float]]:
+        """
+        Make n_ticks ticks in one step without intermediate statistics,
+        return the statistics snapshot after them.
+        """
+        self.advance_to_hour((self._current_tick + n_ticks) * self._tick_hours)
+        return self.statistics()
+
+    def run(self, until: tp.Optional[int] = None) -> tp.Dict[str, tp.Union[int, float]]:
+        """
+        Run the model up to tick `until` (the end of modeling by default)
+        and return the final statistics snapshot.
+        """
+        until = self.total_ticks if until is None else until
+        if until > self._current_tick:
+            return self.advance(until - self._current_tick)
+        return self.statistics()
+
+    @property
+    def seed(self) -> Seed:
+        """Seed of the arrival stream, the drawn one when the model got None"""
+        return self._seed
+
+    @property
+    def total_ticks(self) -> int:
+        """Ticks in the whole modeling period"""
+        return self._modeling_days * HOURS_PER_DAY // self._tick_hours
+
+    @property
+    def end_hour(self) -> int:
+        """Model hour after the last tick"""
+        return self.total_ticks * self._tick_hours
+
+    @property
+    def current_hour(self) -> int:
+        return self._hotel.current_hour
+
+    @property
+    def tick_hours(self) -> int:
+        return self._tick_hours
+
+    def next_arrival_hour(self) -> tp.Optional[int]:
+        """Hour of the next arrival not received yet, None when the flow is over"""
+        if self._pending_start >= len(self._pending_guests):
+            pending = next(self._guests_flow, None)
+            if pending is None:
+                return None
+            self._pending_guests, self._pending_start = pending, 0
+        return self._pending_guests.arrival_hour[self._pending_start]
+
+    def receive_arrivals(self, until_hour: int) -> tp.List[int]:
+        """
+        Receive every arrival up to until_hour without moving the model time,
+        return the departure hours of the guests that got a room
+        """
+        return [day_out * HOURS_PER_DAY for day_out in self._hotel.admit_guests(self._take_arrivals(until_hour))]
+
+    def move_clock(self, hour: int):
+        """
+        Move the model time to any later hour, on the tick grid or not,
+        serving the departures up to it. Arrivals stay pending.
+        """
+        if hour < self.current_hour:
+            raise ValueError(f'cannot go back from hour {self.current_hour} to {hour}')
+        self._hotel.tick(hour - self.current_hour)
+        self._current_tick = hour // self._tick_hours
+
+    def advance_to_hour(self, hour: int):
+        """
+        Receive arrivals up to the hour and move the model time there
+        in one step, the state is the same as after ticking up to the hour.
+        The hour has to be on the tick grid, a multiple of tick_hours.
+        """
+        if hour < self.current_hour:
+            raise ValueError(f'cannot go back from hour {self.current_hour} to {hour}')
+        if hour % self._tick_hours:
+            raise ValueError(f'hour {hour} is not a multiple of tick_hours={self._tick_hours}')
+        self._hotel.recieve_guests(self._take_arrivals(hour))
+        self.move_clock(hour)
+
+    def statistics(self) -> tp.Dict[str, tp.Union[int, float]]:
+        """Snapshot of every KPI at the current model time"""
+        statistics = {name: getattr(self, name) for name in STATISTICS}
+        if self._steady_state:
+            statistics.update(self.steady_state_statistics())
+        return statistics
+
+    def steady_state_statistics(self) -> tp.Dict[str, tp.Union[int, float]]:
+        """
+        STEADY_STATE_STATISTICS at the current model time, every category
+        is averaged after the warm-up of the whole hotel
+        """
+        warmup_days = self.warmup_days()
+        statistics: tp.Dict[str, tp.Union[int, float]] = {'steady_state_warmup_days': warmup_days}
+        for name, category in STEADY_STATE_CATEGORIES:
+            statistics[f'steady_state_{name}_occupation_percent'] = self.steady_state_occupation_percent(
+                category, warmup_days,
+            )
+        return statistics
+    
+
+    def perf_stats(self) -> tp.Dict[str, tp.Union[int, float]]:
+        """Phase times and admission counters so far, empty without instrument=True"""
+        return {} if self._perf is None else self._perf.as_dict()
+
+    def _take_arrivals(self, until_hour: int) -> GuestBatch:
+        """Pending arrivals up to until_hour, as one batch"""
+        taken = []
+        while True:
+            pending = self._pending_guests
+            if self._pending_start >= len(pending):
+                pending = next(self._guests_flow, None)
+                if pending is None:
+                    break
+                self._pending_guests, self._pending_start = pending, 0
+            stop = bisect.bisect_right(pending.arrival_hour, until_hour, self._pending_start)
+            taken.append(pending[self._pending_start:stop])
+            self._pending_start = stop
+            if stop < len(pending):
+                break
+        return GuestBatch.concat(taken) if taken else GuestBatch()
     
 
     @property
@@ -145,6 +402,59 @@ class HotelModel:
         return self._hotel.per_week_hotel_occupation_percent
     
     
+    def window_occupation_percent(self, length: int, category: tp.Optional[int] = None) -> int:
+        return self._hotel.window_occupation_percent(length, category)
+
+
+    def occupancy_series(self, category: tp.Optional[int] = None) -> tp.List[float]:
+        """Share of occupied rooms on every finished model day"""
+        return self._hotel.daily_occupation(0, self.current_hour // HOURS_PER_DAY - 1, category)
+
+    def warmup_days(self, category: tp.Optional[int] = None) -> int:
+        """Transient days at the start of the run, by MSER-5 on the daily occupancy"""
+        return mser(self.occupancy_series(category))
+
+    def steady_state_occupation_percent(
+        self,
+        category: tp.Optional[int] = None,
+        warmup_days: tp.Optional[int] = None,
+    ) -> float:
+        """Average occupation over the finished days after the warm-up, the category's own one by default"""
+        days = self.current_hour // HOURS_PER_DAY
+        if days == 0:
+            return 0.0
+        if warmup_days is None:
+            warmup_days = self.warmup_days(category)
+        return self._hotel.occupation_percent_between(warmup_days, days - 1, category)
+
+    def run_until_steady(
+        self,
+        tolerance: float = 0.5,
+        check_days: int = 30,
+        patience: int = 3,
+    ) -> tp.Dict[str, tp.Union[int, float]]:
+        """
+        Run until the steady-state hotel occupation, checked every check_days,
+        has moved by at most tolerance percentage points for `patience`
+        checks in a row, or up to the end of modeling.
+        Returns the statistics snapshot where the run stopped.
+        """
+        check_ticks = max(1, check_days * HOURS_PER_DAY // self._tick_hours)
+        previous, stable_checks = None, 0
+        while self._current_tick < self.total_ticks:
+            next_tick = min(self._current_tick + check_ticks, self.total_ticks)
+            self.advance_to_hour(next_tick * self._tick_hours)
+            estimate = self.steady_state_occupation_percent()
+            if previous is not None and abs(estimate - previous) <= tolerance:
+                stable_checks += 1
+                if stable_checks >= patience:
+                    break
+            else:
+                stable_checks = 0
+            previous = estimate
+        return self.statistics()
+    
+    
     @property
     def total_luxury_occupation_percent(self):
         return self._hotel.total_luxury_occupation_percent(self._modeling_days)
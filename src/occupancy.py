@@ -0,0 +1,255 @@
+import bisect
+import sys
+import typing as tp
+
+
+class OccupancyCalendar:
+    """
+    Occupancy of a single room stored as an int bitset.
+    Bit number `day` is set when the room is occupied on that day,
+    the calendar grows on demand, so there is no horizon limit.
+    """
+    __slots__ = ('_bits',)
+
+    def __init__(self):
+        self._bits: int = 0
+
+    @staticmethod
+    def _mask(first_day: int, last_day: int) -> int:
+        if last_day < first_day:
+            return 0
+        return ((1 << (last_day - first_day + 1)) - 1) << first_day
+
+    def is_occupied(self, day: int) -> bool:
+        return day >= 0 and bool((self._bits >> day) & 1)
+
+    def is_free(self, first_day: int, last_day: int) -> bool:
+        """Check that no day in [first_day, last_day] is occupied"""
+        return not self._bits & self._mask(first_day, last_day)
+
+    def occupy(self, first_day: int, last_day: int):
+        self._bits |= self._mask(first_day, last_day)
+
+    def days(self, first_day: int, last_day: int) -> tp.Dict[int, bool]:
+        first_day = max(first_day, 0)
+        bits = self._bits >> first_day
+        return {
+            day: bool((bits >> (day - first_day)) & 1)
+            for day in range(first_day, last_day + 1)
+        }
+
+    def __str__(self) -> str:
+        return f'{self._bits:b}'[::-1]
+
+
+class FreeIntervals:
+    """
+    Sorted list of free day intervals [start, end] of a single room.
+    Availability probe is a bisect over interval starts,
+    so it costs O(log bookings) whatever the stay length is.
+    """
+    __slots__ = ('_starts', '_ends')
+
+    def __init__(self, horizon: int = sys.maxsize):
+        self._starts: tp.List[int] = [0]
+        self._ends: tp.List[int] = [horizon]
+
+    def _find(self, first_day: int) -> int:
+        """Index of the free interval containing first_day or -1"""
+        idx = bisect.bisect_right(self._starts, first_day) - 1
+        if idx < 0 or self._ends[idx] < first_day:
+            return -1
+        return idx
+
+    def is_free(self, first_day: int, last_day: int) -> bool:
+        idx = self._find(first_day)
+        return idx >= 0 and self._ends[idx] >= last_day
+
+    def gap(self, first_day: int, last_day: int) -> tp.Optional[tp.Tuple[int, int]]:
+        """Free interval covering [first_day, last_day] if there is one"""
+        idx = self._find(first_day)
+        if idx < 0 or self._ends[idx] < last_day:
+            return None
+        return self._starts[idx], self._ends[idx]
+
+    def occupy(self, first_day: int, last_day: int):
+        """Split the free interval covering [first_day, last_day]"""
+        idx = self._find(first_day)
+        if idx < 0 or self._ends[idx] < last_day:
+            raise ValueError(f'days {first_day}-{last_day} are not free')
+        start, end = self._starts[idx], self._ends[idx]
+        starts, ends = [], []
+        if start < first_day:
+            starts.append(start)
+            ends.append(first_day - 1)
+        if last_day < end:
+            starts.append(last_day + 1)
+            ends.append(end)
+        self._starts[idx:idx+1] = starts
+        self._ends[idx:idx+1] = ends
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
+class CategoryIndex:
+    """
+    Availability index over all rooms of one category.
+    For every day it keeps an int bitset of rooms free on that day,
+    so rooms free for a whole stay are an AND over the stay days
+    and the first-fit room is the lowest set bit.
+    Days after the last booked one are free for every room.
+    """
+    __slots__ = ('_all_rooms', '_free_by_day')
+
+    def __init__(self, number_of_rooms: int):
+        self._all_rooms: int = (1 << number_of_rooms) - 1
+        self._free_by_day: tp.List[int] = []
+
+    def free_rooms(self, first_day: int, last_day: int) -> int:
+        """Bitset of rooms free on every day of [first_day, last_day]"""
+        free_by_day = self._free_by_day
+        rooms = self._all_rooms
+        for day in range(first_day, min(last_day + 1, len(free_by_day))):
+            rooms &= free_by_day[day]
+            if not rooms:
+                break
+        return rooms
+
+    def first_free_room(self, first_day: int, last_day: int) -> int:
+        """Lowest free room id for the stay or -1"""
+        rooms = self.free_rooms(first_day, last_day)
+        return (rooms & -rooms).bit_length() - 1
+
+    def occupy(self, room_id: int, first_day: int, last_day: int):
+        free_by_day = self._free_by_day
+        if len(free_by_day) <= last_day:
+            free_by_day.extend([self._all_rooms] * (last_day + 1 - len(free_by_day)))
+        busy_mask = ~(1 << room_id)
+        for day in range(first_day, last_day + 1):
+            free_by_day[day] &= busy_mask
+
+
+def iter_bits(bits: int) -> tp.Iterator[int]:
+    """Numbers of set bits in ascending order"""
+    while bits:
+        lowest = bits & -bits
+        yield lowest.bit_length() - 1
+        bits ^= lowest
+
+
+class RoomDaysSum:
+    """
+    Occupied room-days per day of one category.
+    A stay adds one room-day to every day of it,
+    prefix sums over days are answered in O(log days)
+    by a pair of Fenwick trees over the day-to-day differences.
+    Trees double in size when a booking goes past the horizon.
+    """
+    __slots__ = ('_size', '_diffs', '_weighted_diffs')
+
+    def __init__(self, size: int = 64):
+        self._size = 1
+        while self._size < size:
+            self._size *= 2
+        self._diffs: tp.List[int] = [0] * (self._size + 1)
+        self._weighted_diffs: tp.List[int] = [0] * (self._size + 1)
+
+    @staticmethod
+    def _query(tree: tp.List[int], position: int) -> int:
+        total = 0
+        while position > 0:
+            total += tree[position]
+            position &= position - 1
+        return total
+
+    def _grow(self, position: int):
+        while self._size < position:
+            # the new root covers the whole old tree, other new nodes are empty
+            for tree in (self._diffs, self._weighted_diffs):
+                root = self._query(tree, self._size)
+                tree.extend([0] * self._size)
+                tree[-1] = root
+            self._size *= 2
+
+    def _update(self, position: int, value: int):
+        self._grow(position)
+        weighted_value = value * position
+        size = self._size
+        while position <= size:
+            self._diffs[position] += value
+            self._weighted_diffs[position] += weighted_value
+            position += position & -position
+
+    def add(self, first_day: int, last_day: int, rooms: int = 1):
+        """Add rooms occupied on every day of [first_day, last_day]"""
+        self._update(first_day + 1, rooms)
+        self._update(last_day + 2, -rooms)
+
+    def prefix(self, day: int) -> int:
+        """Occupied room-days in [0, day]"""
+        if day < 0:
+            return 0
+        position = min(day + 1, self._size)
+        return (day + 2) * self._query(self._diffs, position) - self._query(self._weighted_diffs, position)
+
+    def total(self, first_day: int, last_day: int) -> int:
+        """Occupied room-days in [first_day, last_day]"""
+        return self.prefix(last_day) - self.prefix(first_day - 1)
+
+    def on_day(self, day: int) -> int:
+        """Rooms occupied on the day"""
+        if day < 0:
+            return 0
+        return self._query(self._diffs, min(day + 1, self._size))
+
+
+class OccupancyWindow:
+    """
+    Occupied room-days in the rolling window [first_day, first_day + length - 1].
+    Bookings add their overlap with the window and moving the window
+    only touches the days that leave and enter it, so reads are O(1).
+    """
+    __slots__ = ('_room_days', '_length', '_first_day', '_occupied')
+
+    def __init__(self, room_days: RoomDaysSum, length: int, first_day: int = 0):
+        if length < 1:
+            raise ValueError(f'window length must be positive, got {length}')
+        self._room_days = room_days
+        self._length = length
+        self._first_day = first_day
+        self._occupied = room_days.total(first_day, self.last_day)
+
+    @property
+    def length(self) -> int:
+        return self._length
+
+    @property
+    def last_day(self) -> int:
+        return self._first_day + self._length - 1
+
+    @property
+    def occupied(self) -> int:
+        return self._occupied
+
+    def add(self, first_day: int, last_day: int, rooms: int = 1):
+        """Count a booking already added to the room-days sum"""
+        overlap = min(last_day, self.last_day) - max(first_day, self._first_day) + 1
+        if overlap > 0:
+            self._occupied += overlap * rooms
+
+    def advance(self, first_day: int):
+        shift = first_day - self._first_day
+        if shift == 0:
+            return
+        if not 0 < shift < self._length:
+            self._first_day = first_day
+            self._occupied = self._room_days.total(first_day, self.last_day)
+            return
+        on_day = self._room_days.on_day
+        old_last_day = self.last_day
+        for day in range(self._first_day, first_day):
+            self._occupied -= on_day(day)
+        for day in range(old_last_day + 1, old_last_day + shift + 1):
+            self._occupied += on_day(day)
+        self._first_day = first_day
@@ -0,0 +1,76 @@
+"""
+Optional timing of HotelModel phases and counters of the admission work.
+
+Instrumentation wraps methods on one model instance only, a model built
+without instrument=True runs the plain methods and pays nothing.
+"""
+import functools
+import time
+import typing as tp
+
+# phases of a model step, in the order they happen
+DRAIN = 'drain' # taking arrivals out of the guests flow
+ADMISSION = 'admission' # Hotel.recieve_guests and Hotel.admit_guests
+HOTEL_TICK = 'hotel_tick' # Hotel.tick, departures and windows
+KPI_READS = 'kpi_reads' # statistics snapshots
+PHASES = (DRAIN, ADMISSION, HOTEL_TICK, KPI_READS)
+
+
+class PerfStats:
+    """perf_counter_ns accumulators per phase and admission counters"""
+
+    def __init__(self):
+        self.phase_ns: tp.Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.phase_calls: tp.Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.arrivals = 0
+        self.probes = 0 # room searches, one per tried category
+        self.rejected_probes = 0 # searches that found no free room
+
+    def timed(self, phase: str, function: tp.Callable) -> tp.Callable:
+        @functools.wraps(function)
+        def timed_function(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.phase_ns[phase] += time.perf_counter_ns() - start
+                self.phase_calls[phase] += 1
+        return timed_function
+
+    def counted_arrivals(self, take_arrivals: tp.Callable) -> tp.Callable:
+        @functools.wraps(take_arrivals)
+        def counted(*args, **kwargs):
+            guests = take_arrivals(*args, **kwargs)
+            self.arrivals += len(guests)
+            return guests
+        return counted
+
+    def counted_probes(self, find_room: tp.Callable) -> tp.Callable:
+        @functools.wraps(find_room)
+        def counted(category, day_in, day_out):
+            room_id = find_room(category, day_in, day_out)
+            self.probes += 1
+            if room_id == -1:
+                self.rejected_probes += 1
+            return room_id
+        return counted
+
+    def as_dict(self) -> tp.Dict[str, tp.Union[int, float]]:
+        stats: tp.Dict[str, tp.Union[int, float]] = {}
+        for phase in PHASES:
+            stats[f'{phase}_ms'] = self.phase_ns[phase] / 1e6
+            stats[f'{phase}_calls'] = self.phase_calls[phase]
+        stats['arrivals'] = self.arrivals
+        stats['probes'] = self.probes
+        stats['probes_per_arrival'] = self.probes / self.arrivals if self.arrivals else 0.0
+        stats['rejected_probes'] = self.rejected_probes
+        return stats
+
+
+def format_perf_stats(stats: tp.Dict[str, tp.Union[int, float]]) -> str:
+    """One line for a status bar"""
+    phases = ', '.join(f'{phase} {stats[f"{phase}_ms"]:.1f} ms' for phase in PHASES)
+    return (
+        f'{phases} | {stats["arrivals"]} arrivals, {stats["probes_per_arrival"]:.2f} probes/arrival, '
+        f'{stats["rejected_probes"]} rejected'
+    )
@@ -0,0 +1,191 @@
+import os
+import typing as tp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from src.estimates import KpiSummary, RunningStatistics, summarize_samples
+from src.modeling import ALL_STATISTICS, ENGINES, OBJECT_ENGINE, STATISTICS, STEADY_STATE_STATISTICS, HotelModel, statistics_names
+from src.seeding import Seed, child_seed, spawn_seeds
+
+# one replication result: KPI values in statistics_names order of its config
+Record = tp.Tuple[float, ...]
+# replications of a scenario between precision checks of run_until_precision;
+# the stopping point depends on it, so it does not follow the number of workers
+SEQUENTIAL_BATCH_SIZE = 8
+
+
+def run_replication(job: tp.Tuple[tp.Dict[str, tp.Any], Seed]) -> Record:
+    """Worker: run one model to the end, send back only the KPI values"""
+    config, seed = job
+    statistics = HotelModel(**config, seed=seed).run()
+    return tuple(statistics[name] for name in statistics_names(config.get('steady_state', False)))
+
+
+def record_names(records: tp.Sequence[Record]) -> tp.Tuple[str, ...]:
+    """KPIs of the records, with the steady-state ones when the runs had them"""
+    return ALL_STATISTICS[:len(records[0])] if records else STATISTICS
+
+
+def map_jobs(
+    function: tp.Callable,
+    jobs: tp.Sequence,
+    workers: tp.Optional[int] = None,
+) -> tp.List:
+    """Run jobs on a process pool, in this process for a single worker"""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        return [function(job) for job in jobs]
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(function, jobs, chunksize=chunksize))
+
+
+@dataclass
+class ReplicationResult:
+    seeds: tp.List[Seed]
+    records: tp.List[Record]
+    confidence: float = 0.95
+    summary: tp.Dict[str, KpiSummary] = field(init=False)
+
+    def __post_init__(self):
+        self.summary = summarize_records(self.records, self.confidence)
+
+    @property
+    def replications(self) -> int:
+        return len(self.records)
+
+    def samples(self, kpi: str) -> tp.List[float]:
+        index = record_names(self.records).index(kpi)
+        return [record[index] for record in self.records]
+
+
+def summarize_records(records: tp.Sequence[Record], confidence: float = 0.95) -> tp.Dict[str, KpiSummary]:
+    return {
+        name: summarize_samples([record[index] for record in records], confidence)
+        for index, name in enumerate(record_names(records))
+    }
+
+
+def run_replications(
+    config: tp.Dict[str, tp.Any],
+    replications: int,
+    seed: tp.Optional[Seed] = None,
+    workers: tp.Optional[int] = None,
+    confidence: float = 0.95,
+) -> ReplicationResult:
+    """
+    Run independent replications of one HotelModel configuration
+    (HotelModel keyword arguments without seed) on a process pool
+    and summarize every KPI with mean, std and confidence interval.
+    """
+    seeds = spawn_seeds(seed, replications)
+    records = map_jobs(run_replication, [(config, replication_seed) for replication_seed in seeds], workers)
+    return ReplicationResult(seeds=seeds, records=records, confidence=confidence)
+
+
+@dataclass
+class SequentialResult(ReplicationResult):
+    """Replications of one scenario run until its KPIs reached the target precision"""
+    converged: bool = False
+
+
+def run_until_precision(
+    configs: tp.Sequence[tp.Dict[str, tp.Any]],
+    kpis: tp.Sequence[str] = ('current_hotel_total_earnings',),
+    relative_half_width: float = 0.05,
+    max_replications: int = 1000,
+    min_replications: int = 10,
+    batch_size: int = SEQUENTIAL_BATCH_SIZE,
+    seed: tp.Optional[Seed] = None,
+    workers: tp.Optional[int] = None,
+    confidence: float = 0.95,
+) -> tp.List[SequentialResult]:
+    """
+    Sequential stopping rule: run batches of replications of every scenario
+    in parallel until the relative CI half-width of each chosen KPI is below
+    the target, or the scenario used max_replications. Scenarios are checked
+    after every batch, a converged scenario stops getting jobs.
+    """
+    unknown = set(kpis) - set(ALL_STATISTICS)
+    if unknown:
+        raise ValueError(f'unknown KPIs {sorted(unknown)}')
+    if set(kpis) & set(STEADY_STATE_STATISTICS) and not all(config.get('steady_state') for config in configs):
+        raise ValueError('steady-state KPIs need steady_state=True in every configuration')
+    if batch_size < 1:
+        raise ValueError(f'batch_size must be positive, got {batch_size}')
+    workers = workers or os.cpu_count() or 1
+    indexes = [ALL_STATISTICS.index(kpi) for kpi in kpis]
+    parents = spawn_seeds(seed, len(configs))
+    estimators = [[RunningStatistics() for _ in kpis] for _ in configs]
+    seeds: tp.List[tp.List[Seed]] = [[] for _ in configs]
+    records: tp.List[tp.List[Record]] = [[] for _ in configs]
+    converged = [False] * len(configs)
+    finished = [False] * len(configs)
+
+    def precise(scenario: int) -> bool:
+        return len(records[scenario]) >= max(min_replications, 2) and all(
+            estimator.summary(confidence).relative_half_width <= relative_half_width
+            for estimator in estimators[scenario]
+        )
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        while not all(finished):
+            jobs = []
+            for scenario, config in enumerate(configs):
+                if finished[scenario]:
+                    continue
+                done = len(seeds[scenario])
+                for replication in range(done, min(done + batch_size, max_replications)):
+                    replication_seed = child_seed(parents[scenario], replication)
+                    seeds[scenario].append(replication_seed)
+                    jobs.append((scenario, (config, replication_seed)))
+            if executor is None:
+                results = [run_replication(job) for _, job in jobs]
+            else:
+                results = executor.map(run_replication, [job for _, job in jobs])
+            for (scenario, _), record in zip(jobs, results):
+                records[scenario].append(record)
+                for estimator, index in zip(estimators[scenario], indexes):
+                    estimator.add(record[index])
+            for scenario in range(len(configs)):
+                if not finished[scenario]:
+                    converged[scenario] = precise(scenario)
+                    finished[scenario] = converged[scenario] or len(seeds[scenario]) >= max_replications
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return [
+        SequentialResult(
+            seeds=seeds[scenario],
+            records=records[scenario],
+            confidence=confidence,
+            converged=converged[scenario],
+        )
+        for scenario in range(len(configs))
+    ]
+
+
+def engine_differences(
+    config: tp.Dict[str, tp.Any],
+    seed: Seed,
+    engines: tp.Sequence[str] = ENGINES,
+) -> tp.List[tp.Tuple[int, str, str, tp.Any, tp.Any]]:
+    """
+    Run one configuration and seed on every engine in lockstep and compare
+    each statistics snapshot with the reference engine's one exactly.
+    Returns (tick, engine, KPI, reference value, engine value) for every mismatch.
+    """
+    reference = HotelModel(**{**config, 'engine': OBJECT_ENGINE}, seed=seed)
+    models = {engine: HotelModel(**{**config, 'engine': engine}, seed=seed) for engine in engines if engine != OBJECT_ENGINE}
+    differences = []
+    for tick in range(1, reference.total_ticks + 1):
+        expected = reference.advance(1)
+        for engine, model in models.items():
+            actual = model.advance(1)
+            differences.extend(
+                (tick, engine, name, expected[name], actual[name])
+                for name in expected
+                if expected[name] != actual[name]
+            )
+    return differences
@@ -1,6 +1,9 @@
+import heapq
+import logging
 import typing as tp
 
 from src.guest import Guest
+from src.occupancy import FreeIntervals, OccupancyCalendar
 from src.utils import logger
 
 
@@ -10,21 +13,22 @@ class Room:
         price: int,
     ):
         self._price = price
-        self._occupation: tp.Dict[int, bool] = {new_day: False for new_day in range(45)}
-        self._guest_days_out: tp.Set[int] = set()
+        self._occupation = OccupancyCalendar()
+        self._free_intervals = FreeIntervals()
+        self._guest_days_out: tp.List[int] = [] # min-heap of departure days
         
         self._total_served_guests: int = 0
         self._total_earnings: int = 0
         self._total_ticks: int = 0
 
     def current_occupation_in_week(self, day) -> tp.Dict[int, bool]:
-        return {key: value for key, value in self._occupation.items() if day <= key <= day+7}
+        return self._occupation.days(day, day+7)
     
     def occupation_in_model(self, day) -> tp.Dict[int, bool]:
-        return {key: value for key, value in self._occupation.items() if 0 <= key <= day}
+        return self._occupation.days(0, day)
     
     def is_occupied(self, day):
-        return self._occupation[day]
+        return self._occupation.is_occupied(day)
 
     @property
     def total_served_guests(self) -> int:
@@ -34,29 +38,42 @@ class Room:
     def total_earnings(self):
         return round(self._total_earnings, 1)
     
+    def is_free(self, day_in: int, day_out: int) -> bool:
+        return self._free_intervals.is_free(day_in, day_out)
+    
+    def free_gap_length(self, day_in: int, day_out: int) -> int:
+        """Length of the free gap the stay would be placed in, -1 if busy"""
+        gap = self._free_intervals.gap(day_in, day_out)
+        if gap is None:
+            return -1
+        return gap[1] - gap[0] + 1
+    
     def receive_guest(self, new_guest: Guest) -> bool:
         """Check if the room is available"""
-        is_room_busy = False
-        for day in range(new_guest.day_in, new_guest.day_out+1):
-            is_room_busy = is_room_busy or self._occupation[day]
-        if is_room_busy:
+        if not self.is_free(new_guest.day_in, new_guest.day_out):
             return False
         
-        for day in range(new_guest.day_in, new_guest.day_out+1):
-            self._occupation[day] = True
-        self._guest_days_out.add(new_guest.day_out)
+        self._free_intervals.occupy(new_guest.day_in, new_guest.day_out)
+        self._occupation.occupy(new_guest.day_in, new_guest.day_out)
+        heapq.heappush(self._guest_days_out, new_guest.day_out)
         self._total_earnings += self._price * (1 - float(new_guest.discount)/100)
         return True
     
+    def check_out(self, day: int) -> int:
+        """Serve guests leaving up to the day, return how many left"""
+        count_surved_guests = 0
+        while self._guest_days_out and self._guest_days_out[0] <= day:
+            heapq.heappop(self._guest_days_out)
+            count_surved_guests += 1
+        self._total_served_guests += count_surved_guests
+        return count_surved_guests
+    
     def tick(self, day: int):
         """
         Serve guests and write stats
         """
-        count_surved_guests = 0
-        for day_out in self._guest_days_out:
-            if day_out <= day:
-                count_surved_guests += 1
-        self._total_served_guests = count_surved_guests
+        self.check_out(day)
         self._total_ticks += 1
 
-        logger.debug(f'Load at end of tick: {self._occupation}')
\ No newline at end of file
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'Load at end of tick: {self._occupation}')
\ No newline at end of file
@@ -0,0 +1,203 @@
+import sys
+import typing as tp
+
+import numpy as np
+
+from src.guest import Guest
+from src.hotel import CATEGORY_NAMES, FIRST_FIT, Hotel
+from src.utils import HOURS_PER_DAY
+
+
+class RoomTable:
+    """
+    All rooms of a hotel in struct-of-arrays form.
+    Rooms of one category are a contiguous block of rows in the price and
+    earnings vectors. Occupancy of a category is a days x rooms matrix of
+    packed bits, so rooms busy during a stay are an OR over the stay rows.
+    Days double on demand. The first and the last occupied day of every
+    room bound the best-fit search.
+    """
+
+    def __init__(self, number_of_rooms: tp.Dict[int, int], costs: tp.Dict[int, int], days: int = 64):
+        categories = sorted(CATEGORY_NAMES)
+        counts = [number_of_rooms[category] for category in categories]
+        self._number_of_rooms = dict(number_of_rooms)
+        self._rows: tp.Dict[int, slice] = {}
+        first_row = 0
+        for category, count in zip(categories, counts):
+            self._rows[category] = slice(first_row, first_row + count)
+            first_row += count
+
+        self.price = np.repeat(np.array([costs[category] for category in categories], dtype=np.float64), counts)
+        self.earnings = np.zeros(first_row, dtype=np.float64)
+        # bit room_id % 8 of byte room_id // 8 in row `day` is set when the room is occupied
+        self._bits: tp.Dict[int, np.ndarray] = {
+            category: np.zeros((days, (count + 7) // 8), dtype=np.uint8)
+            for category, count in zip(categories, counts)
+        }
+        self._days = days
+        self._first_busy_day: tp.Dict[int, np.ndarray] = {
+            category: np.full(count, np.iinfo(np.int64).max, dtype=np.int64)
+            for category, count in zip(categories, counts)
+        }
+        self._last_busy_day: tp.Dict[int, np.ndarray] = {
+            category: np.full(count, -1, dtype=np.int64)
+            for category, count in zip(categories, counts)
+        }
+
+    def rows(self, category: int) -> slice:
+        return self._rows[category]
+
+    def row(self, category: int, room_id: int) -> int:
+        return self._rows[category].start + room_id
+
+    @property
+    def days(self) -> int:
+        return self._days
+
+    def ensure_days(self, last_day: int):
+        if last_day < self._days:
+            return
+        days = self._days
+        while days <= last_day:
+            days *= 2
+        for category, bits in self._bits.items():
+            grown = np.zeros((days, bits.shape[1]), dtype=np.uint8)
+            grown[:self._days] = bits
+            self._bits[category] = grown
+        self._days = days
+
+    def _unpack(self, category: int, bits: np.ndarray) -> np.ndarray:
+        return np.unpackbits(
+            bits, axis=-1, count=self._number_of_rooms[category], bitorder='little',
+        ).astype(bool)
+
+    def occupancy(self, category: int, first_day: int, last_day: int) -> np.ndarray:
+        """Rooms x days bool matrix of the category for [first_day, last_day]"""
+        self.ensure_days(last_day)
+        return self._unpack(category, self._bits[category][first_day:last_day+1]).T
+
+    def occupied_on(self, category: int, day: int) -> np.ndarray:
+        if day >= self._days:
+            return np.zeros(self._number_of_rooms[category], dtype=bool)
+        return self._unpack(category, self._bits[category][day])
+
+    def busy_bits(self, category: int, first_day: int, last_day: int) -> np.ndarray:
+        """Packed bits of the category rooms busy on any day of [first_day, last_day]"""
+        stay = self._bits[category][first_day:last_day+1]
+        if stay.shape[0] == 0:
+            return np.zeros(self._bits[category].shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(stay, axis=0)
+
+    def busy_rooms(self, category: int, first_day: int, last_day: int) -> np.ndarray:
+        """Per room of the category: is any day of [first_day, last_day] occupied"""
+        return self._unpack(category, self.busy_bits(category, first_day, last_day))
+
+    def first_clear_bit(self, category: int, busy: np.ndarray) -> int:
+        """Lowest room id of the category with a clear bit in packed busy bits, or -1"""
+        # one int over the packed bytes is cheaper than a numpy search for any hotel size
+        bits = int.from_bytes(busy.tobytes(), 'little')
+        room_id = (~bits & (bits + 1)).bit_length() - 1
+        # padding bits of the last byte are clear but are not rooms
+        return room_id if room_id < self._number_of_rooms[category] else -1
+
+    def first_free_room(self, category: int, first_day: int, last_day: int) -> int:
+        return self.first_clear_bit(category, self.busy_bits(category, first_day, last_day))
+
+    def best_free_room(self, category: int, first_day: int, last_day: int) -> int:
+        """Free room with the shortest free gap around the stay, lowest id on ties"""
+        busy = self.busy_bits(category, first_day, last_day)
+        if self.first_clear_bit(category, busy) == -1:
+            return -1
+        candidates = np.flatnonzero(~self._unpack(category, busy))
+        gap_start = np.zeros(candidates.size, dtype=np.int64)
+        booked_before = np.flatnonzero(self._first_busy_day[category][candidates] < first_day)
+        if booked_before.size:
+            # days past the table are free, the scan back starts at its last day
+            gap_start[booked_before] = self._nearest_busy_days(
+                category, candidates[booked_before], min(first_day, self._days) - 1, -1,
+            ) + 1
+        gap_end = np.full(candidates.size, sys.maxsize, dtype=np.int64)
+        booked_after = np.flatnonzero(self._last_busy_day[category][candidates] > last_day)
+        if booked_after.size:
+            gap_end[booked_after] = self._nearest_busy_days(
+                category, candidates[booked_after], last_day + 1, 1,
+            ) - 1
+        return int(candidates[np.argmin(gap_end - gap_start)])
+
+    def _nearest_busy_days(self, category: int, rooms: np.ndarray, from_day: int, step: int) -> np.ndarray:
+        """
+        First occupied day of every room going from from_day by step (1 or -1).
+        Every room must have one. Days are read on the packed bytes of the rooms
+        in windows that double, so a room costs about its distance to the day.
+        """
+        bits = self._bits[category]
+        columns = rooms >> 3
+        masks = (1 << (rooms & 7)).astype(np.uint8)
+        nearest = np.empty(rooms.size, dtype=np.int64)
+        pending = np.arange(rooms.size)
+        day, width = from_day, 8
+        while pending.size:
+            if step > 0:
+                first, last = day, min(day + width, self._days)
+                window = bits[first:last, columns[pending]] & masks[pending]
+            else:
+                first, last = max(day - width + 1, 0), day + 1
+                window = bits[first:last, columns[pending]][::-1] & masks[pending]
+            busy = window != 0
+            found = busy.any(axis=0)
+            offsets = busy.argmax(axis=0)[found]
+            nearest[pending[found]] = day + step * offsets
+            pending = pending[~found]
+            day += step * (last - first)
+            width *= 2
+        return nearest
+
+    def occupy(self, category: int, room_id: int, first_day: int, last_day: int):
+        self.ensure_days(last_day)
+        self._bits[category][first_day:last_day+1, room_id >> 3] |= np.uint8(1 << (room_id & 7))
+        first_busy_day, last_busy_day = self._first_busy_day[category], self._last_busy_day[category]
+        first_busy_day[room_id] = min(first_busy_day[room_id], first_day)
+        last_busy_day[room_id] = max(last_busy_day[room_id], last_day)
+
+
+class RoomTableHotel(Hotel):
+    """
+    Hotel keeping its rooms in a RoomTable instead of Room objects.
+    Availability checks are vectorized over all rooms of a category,
+    bookings, statistics and results are the same as for Hotel.
+    """
+
+    def _create_rooms(self, costs: tp.Dict[int, int]):
+        self._table = RoomTable(self._number_of_rooms, costs)
+
+    @property
+    def room_table(self) -> RoomTable:
+        return self._table
+
+    def _find_room(self, category: int, day_in: int, day_out: int) -> int:
+        if self._room_choice == FIRST_FIT:
+            return self._table.first_free_room(category, day_in, day_out)
+        return self._table.best_free_room(category, day_in, day_out)
+
+    def _book_room(self, category: int, room_id: int, guest: Guest) -> float:
+        table = self._table
+        table.occupy(category, room_id, guest.day_in, guest.day_out)
+        row = table.row(category, room_id)
+        # python floats and the same order of operations as Room keep earnings bit-identical
+        earnings_before = float(table.earnings[row])
+        earnings = earnings_before + float(table.price[row]) * (1 - float(guest.discount)/100)
+        table.earnings[row] = earnings
+        return round(earnings, 1) - round(earnings_before, 1)
+
+    def _check_out_room(self, category: int, room_id: int, day: int) -> int:
+        # every departure in the heap is one guest, served counters stay in Hotel
+        return 1
+
+    def _occupancy_today(self, category: int) -> tp.List[bool]:
+        return self._table.occupied_on(category, self._current_day_hours // HOURS_PER_DAY).tolist()
+
+    def _occupancy_in_week(self, category: int) -> tp.List[tp.Dict[int, bool]]:
+        day = self._current_day_hours // HOURS_PER_DAY
+        week = self._table.occupancy(category, day, day+7)
+        return [dict(zip(range(day, day+8), row)) for row in week.tolist()]
@@ -0,0 +1,82 @@
+"""
+Seeds for HotelModel random streams.
+
+A seed is an int or a numpy SeedSequence. Every model owns its generator,
+child streams for replications and sweeps come from the SeedSequence spawn
+tree, so they do not overlap whatever the number of processes.
+"""
+import random
+import secrets
+import typing as tp
+
+if tp.TYPE_CHECKING:
+    import numpy as np
+
+Seed = tp.Union[int, 'np.random.SeedSequence']
+# a SeedSequence as JSON-friendly ints: entropy, then the spawn key
+SeedKey = tp.List[int]
+
+
+def is_seed_sequence(seed: tp.Any) -> bool:
+    return hasattr(seed, 'generate_state') and hasattr(seed, 'spawn')
+
+
+def resolve_seed(seed: tp.Optional[Seed]) -> Seed:
+    """The seed itself, or fresh OS entropy for None so the run can be repeated"""
+    if seed is None:
+        return secrets.randbits(64)
+    if isinstance(seed, int) or is_seed_sequence(seed):
+        return seed
+    raise TypeError(f'seed must be an int or a SeedSequence, got {type(seed).__name__}')
+
+
+def python_random(seed: Seed) -> random.Random:
+    """
+    random.Random for the python arrivals. An int seeds it directly,
+    the same stream as random.seed(int) on the global generator.
+    """
+    if is_seed_sequence(seed):
+        words = seed.generate_state(4, 'uint32') # 128 bits of the sequence
+        seed = sum(int(word) << (32 * index) for index, word in enumerate(words))
+    return random.Random(seed)
+
+
+def seed_sequence(seed: tp.Optional[Seed]) -> 'np.random.SeedSequence':
+    """SeedSequence of the seed, fresh OS entropy for None"""
+    import numpy as np # numpy is only needed to spawn streams
+    return seed if is_seed_sequence(seed) else np.random.SeedSequence(seed)
+
+
+def spawn_seeds(seed: tp.Optional[Seed], children: int) -> tp.List['np.random.SeedSequence']:
+    """
+    Independent child seeds 0..children-1 of the seed. The seed is not
+    advanced, the same SeedSequence gives the same children on every call.
+    """
+    parent = seed_sequence(seed)
+    return [child_seed(parent, child) for child in range(children)]
+
+
+def child_seed(seed: Seed, *key: int) -> 'np.random.SeedSequence':
+    """
+    Child of the seed at a fixed position of the spawn tree. Unlike spawn
+    it keeps no counter, so the same key gives the same child every time.
+    child_seed(seed, i) is spawn_seeds(seed, n)[i].
+    """
+    import numpy as np
+    parent = seed_sequence(seed)
+    return np.random.SeedSequence(parent.entropy, spawn_key=(*parent.spawn_key, *key))
+
+
+def seed_key(seed: Seed) -> tp.Union[int, SeedKey]:
+    """Seed in a form that can be written to JSON"""
+    if is_seed_sequence(seed):
+        return [int(seed.entropy), *seed.spawn_key]
+    return seed
+
+
+def seed_from_key(key: tp.Union[int, SeedKey]) -> Seed:
+    if isinstance(key, int):
+        return key
+    import numpy as np
+    entropy, *spawn_key = key
+    return np.random.SeedSequence(entropy, spawn_key=tuple(spawn_key))
@@ -0,0 +1,215 @@
+import itertools
+import json
+import os
+import typing as tp
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from src.estimates import KpiSummary, summarize_samples
+from src.modeling import ALL_STATISTICS
+from src.replications import run_replication
+from src.seeding import Seed, SeedKey, child_seed, resolve_seed, seed_from_key, seed_key, seed_sequence
+
+# a sampled parameter is an inclusive (low, high) int range or a list of choices
+ParameterSpace = tp.Dict[str, tp.Union[tp.Tuple[int, int], tp.List[tp.Any]]]
+# (scenario, replication, HotelModel keyword arguments, seed)
+Job = tp.Tuple[int, int, tp.Dict[str, tp.Any], Seed]
+# occupation percents of a category divide by its number of rooms
+ROOM_COUNTS = (
+    'model_number_of_luxury_rooms',
+    'model_number_of_junior_suites',
+    'model_number_of_double_rooms',
+    'model_number_of_single_rooms',
+)
+
+
+def grid(parameters: tp.Dict[str, tp.Sequence[tp.Any]]) -> tp.List[tp.Dict[str, tp.Any]]:
+    """Every combination of parameter values"""
+    names = list(parameters)
+    return [dict(zip(names, values)) for values in itertools.product(*parameters.values())]
+
+
+def _from_unit(spec, uniform: np.ndarray) -> tp.List[tp.Any]:
+    if isinstance(spec, tuple):
+        low, high = spec
+        values = low + np.minimum(np.floor(uniform * (high - low + 1)).astype(np.int64), high - low)
+        return values.tolist()
+    indexes = np.minimum(np.floor(uniform * len(spec)).astype(np.int64), len(spec) - 1)
+    return [spec[index] for index in indexes]
+
+
+def random_sample(space: ParameterSpace, samples: int, seed: tp.Optional[int] = None) -> tp.List[tp.Dict[str, tp.Any]]:
+    """Independent uniform samples of every parameter"""
+    rng = np.random.default_rng(seed)
+    columns = {name: _from_unit(spec, rng.random(samples)) for name, spec in space.items()}
+    return [{name: columns[name][index] for name in space} for index in range(samples)]
+
+
+def latin_hypercube(space: ParameterSpace, samples: int, seed: tp.Optional[int] = None) -> tp.List[tp.Dict[str, tp.Any]]:
+    """Latin hypercube: every parameter hits each of `samples` equal strata once"""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, spec in space.items():
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        columns[name] = _from_unit(spec, strata)
+    return [{name: columns[name][index] for name in space} for index in range(samples)]
+
+
+def check_scenarios(base_config: tp.Dict[str, tp.Any], scenarios: tp.Sequence[tp.Dict[str, tp.Any]]):
+    """Refuse a sweep with a scenario that has no rooms in some category, before anything runs"""
+    for scenario, overrides in enumerate(scenarios):
+        config = {**base_config, **overrides}
+        empty = [name for name in ROOM_COUNTS if name in config and config[name] < 1]
+        if empty:
+            raise ValueError(f'scenario {scenario} needs at least one room, got {", ".join(f"{name}={config[name]}" for name in empty)}')
+
+
+def sweep_jobs(
+    base_config: tp.Dict[str, tp.Any],
+    scenarios: tp.Sequence[tp.Dict[str, tp.Any]],
+    replications: int,
+    seed: Seed,
+) -> tp.Iterator[Job]:
+    """
+    Scenario x replication jobs. The job seed is the child of seed at
+    (scenario, replication), so it does not depend on which jobs run
+    or in which order.
+    """
+    for scenario, overrides in enumerate(scenarios):
+        config = {**base_config, **overrides}
+        for replication in range(replications):
+            yield scenario, replication, config, child_seed(seed, scenario, replication)
+
+
+def run_sweep_chunk(jobs: tp.List[Job]) -> tp.List[tp.Dict[str, tp.Any]]:
+    """Worker: run a chunk of jobs, send back compact result records"""
+    records = []
+    for scenario, replication, config, seed in jobs:
+        values = run_replication((config, seed))
+        records.append({
+            'scenario': scenario,
+            'replication': replication,
+            'seed': seed_key(seed),
+            'statistics': dict(zip(ALL_STATISTICS, values)),
+        })
+    return records
+
+
+def _root_key(job_seed: SeedKey) -> SeedKey:
+    """Key of the sweep seed a job seed was derived from"""
+    return job_seed[:-2]
+
+
+def _finished_jobs(output_path: str) -> tp.Tuple[tp.Set[tp.Tuple[int, int]], tp.Optional[SeedKey]]:
+    """
+    Jobs already in the results file and the key of the sweep seed
+    they were run with, a line cut by a crash is dropped
+    """
+    finished = set()
+    root = None
+    if not os.path.exists(output_path):
+        return finished, root
+    good_size = 0
+    with open(output_path, 'rb') as results:
+        for line in results:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            finished.add((record['scenario'], record['replication']))
+            root = _root_key(record['seed'])
+            good_size += len(line)
+    if good_size != os.path.getsize(output_path):
+        with open(output_path, 'r+b') as results:
+            results.truncate(good_size)
+    return finished, root
+
+
+def _chunks(jobs: tp.Iterable[Job], chunk_size: int) -> tp.Iterator[tp.List[Job]]:
+    jobs = iter(jobs)
+    while True:
+        chunk = list(itertools.islice(jobs, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_sweep(
+    base_config: tp.Dict[str, tp.Any],
+    scenarios: tp.Sequence[tp.Dict[str, tp.Any]],
+    replications: int,
+    output_path: str,
+    seed: tp.Optional[Seed] = None,
+    workers: tp.Optional[int] = None,
+    chunk_size: int = 16,
+) -> int:
+    """
+    Run every scenario (overrides of base_config) `replications` times on a
+    process pool. Results are appended to a JSON lines file as chunks finish,
+    and jobs already in the file are skipped, so an interrupted sweep resumes
+    where it stopped. Returns the number of jobs run by this call.
+
+    Every record keeps its job seed, so the sweep seed can be read back:
+    resuming with seed=None continues with the seed the file was started
+    with, an explicit seed has to be the same one.
+    """
+    check_scenarios(base_config, scenarios)
+    finished, root = _finished_jobs(output_path)
+    if root is None:
+        seed = seed_sequence(resolve_seed(seed))
+    else:
+        if seed is not None and seed_key(seed_sequence(seed)) != root:
+            raise ValueError(f'{output_path} was started with seed {root}, not {seed_key(seed)}')
+        seed = seed_from_key(root)
+    jobs = (job for job in sweep_jobs(base_config, scenarios, replications, seed) if job[:2] not in finished)
+    workers = workers or os.cpu_count() or 1
+    done = 0
+    with open(output_path, 'a', encoding='utf-8') as output:
+        def write(records: tp.List[tp.Dict[str, tp.Any]]):
+            for record in records:
+                output.write(json.dumps(record) + '\n')
+            output.flush()
+
+        if workers == 1:
+            for chunk in _chunks(jobs, chunk_size):
+                write(run_sweep_chunk(chunk))
+                done += len(chunk)
+            return done
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            running: tp.Set[Future] = set()
+            chunks = _chunks(jobs, chunk_size)
+            while True:
+                # keep a bounded number of chunks in flight, the job list is never materialized
+                for chunk in itertools.islice(chunks, 2 * workers - len(running)):
+                    running.add(executor.submit(run_sweep_chunk, chunk))
+                if not running:
+                    break
+                completed, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    records = future.result()
+                    write(records)
+                    done += len(records)
+    return done
+
+
+def read_sweep(output_path: str) -> tp.Iterator[tp.Dict[str, tp.Any]]:
+    with open(output_path, encoding='utf-8') as results:
+        for line in results:
+            yield json.loads(line)
+
+
+def summarize_sweep(output_path: str, confidence: float = 0.95) -> tp.Dict[int, tp.Dict[str, KpiSummary]]:
+    """KPI summaries per scenario from a results file"""
+    samples: tp.Dict[int, tp.Dict[str, tp.List[float]]] = {}
+    for record in read_sweep(output_path):
+        scenario_samples = samples.setdefault(record['scenario'], {name: [] for name in record['statistics']})
+        for name, values in scenario_samples.items():
+            values.append(record['statistics'][name])
+    return {
+        scenario: {name: summarize_samples(values, confidence) for name, values in kpis.items()}
+        for scenario, kpis in sorted(samples.items())
+    }
@@ -0,0 +1,91 @@
+"""
+Binary event trace of a run: one fixed-width record per booking, lost client
+and departure, written through a buffer with no text formatting.
+
+    with TraceWriter('run.trace') as trace:
+        HotelModel(**config, trace=trace).run()
+    events = read_trace('run.trace') # numpy structured array
+"""
+import struct
+
+MAGIC = b'HTRACE1\0'
+
+BOOKED = 0 # guest got a room at their arrival hour, price is what the guest pays
+LOST = 1 # no room in the preferred or a fallback category at the arrival hour, room_id is -1
+DEPARTED = 2 # guest left the room, hour is the start of day_out
+OUTCOMES = {BOOKED: 'booked', LOST: 'lost', DEPARTED: 'departed'}
+
+# hour, guest id, category, room id, day_in, day_out, price, outcome, little endian without padding
+RECORD = struct.Struct('<qqbiiidb')
+TRACE_FIELDS = (
+    ('hour', '<i8'),
+    ('guest_id', '<i8'),
+    ('category', 'i1'),
+    ('room_id', '<i4'),
+    ('day_in', '<i4'),
+    ('day_out', '<i4'),
+    ('price', '<f8'),
+    ('outcome', 'i1'),
+)
+TRACE_BUFFER_RECORDS = 65536
+
+
+class TraceWriter:
+    """Packs records into a preallocated buffer and writes it out when full"""
+
+    def __init__(self, path: str, buffer_records: int = TRACE_BUFFER_RECORDS):
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC)
+        self._buffer = bytearray(RECORD.size * buffer_records)
+        self._offset = 0
+        self._records = 0
+
+    def record(
+        self,
+        hour: int,
+        guest_id: int,
+        category: int,
+        room_id: int,
+        day_in: int,
+        day_out: int,
+        price: float,
+        outcome: int,
+    ):
+        if self._offset == len(self._buffer):
+            self.flush()
+        RECORD.pack_into(self._buffer, self._offset, hour, guest_id, category, room_id, day_in, day_out, price, outcome)
+        self._offset += RECORD.size
+        self._records += 1
+
+    @property
+    def records(self) -> int:
+        return self._records
+
+    def flush(self):
+        self._file.write(memoryview(self._buffer)[:self._offset])
+        self._offset = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self) -> 'TraceWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_trace(path: str):
+    """Memory-mapped trace as a numpy structured array with TRACE_FIELDS columns"""
+    import numpy as np # numpy is only needed to read traces back
+    dtype = np.dtype(list(TRACE_FIELDS))
+    with open(path, 'rb') as trace_file:
+        if trace_file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f'{path} is not a hotel trace')
+        size = trace_file.seek(0, 2) - len(MAGIC)
+    if size < RECORD.size:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', offset=len(MAGIC), shape=(size // RECORD.size,))
@@ -8,14 +8,18 @@
 # run again.  Do not edit this file unless you know what you are doing.
 
 
+import logging
+
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 
 from src.modeling import HotelModel
+from src.perf import format_perf_stats
 from src.utils import logger, HOURS_PER_DAY
 
 
 class Ui_HotelModelUI(object):
+    show_perf_stats = False # time model phases and show them in the status bar
 
     def setup_model(self):
         modeling_days = int(self.modeling_days.text())
@@ -49,47 +53,54 @@ class Ui_HotelModelUI(object):
 
         self.model: HotelModel = HotelModel(
             **self.model_config,
+            instrument=self.show_perf_stats,
         )
 
     def model_tick(self):
         self.model.tick()
+        self.show_statistics(self.model.statistics())
 
-        self.luxary_workload_in_week.setValue(self.model.per_week_luxury_occupation_percent) 
-        self.junior_suite_workload_in_week.setValue(self.model.per_week_junior_occupation_percent)
-        self.double_room_workload_in_week.setValue(self.model.per_week_double_occupation_percent)
-        self.single_room_workload_in_week.setValue(self.model.per_week_single_occupation_percent)
-        self.hotel_workload_in_week.setValue(self.model.per_week_hotel_occupation_percent)
+    def show_statistics(self, statistics):
+        self.luxary_workload_in_week.setValue(statistics['per_week_luxury_occupation_percent']) 
+        self.junior_suite_workload_in_week.setValue(statistics['per_week_junior_occupation_percent'])
+        self.double_room_workload_in_week.setValue(statistics['per_week_double_occupation_percent'])
+        self.single_room_workload_in_week.setValue(statistics['per_week_single_occupation_percent'])
+        self.hotel_workload_in_week.setValue(statistics['per_week_hotel_occupation_percent'])
 
-        self.luxary_workload.setValue(self.model.total_luxury_occupation_percent) 
-        self.junior_suite_workload.setValue(self.model.total_junior_occupation_percent)
-        self.double_room_workload.setValue(self.model.total_double_occupation_percent)
-        self.single_room_workload.setValue(self.model.total_single_occupation_percent)
-        self.hotel_workload.setValue(self.model.total_hotel_occupation_percent)
+        self.luxary_workload.setValue(statistics['total_luxury_occupation_percent']) 
+        self.junior_suite_workload.setValue(statistics['total_junior_occupation_percent'])
+        self.double_room_workload.setValue(statistics['total_double_occupation_percent'])
+        self.single_room_workload.setValue(statistics['total_single_occupation_percent'])
+        self.hotel_workload.setValue(statistics['total_hotel_occupation_percent'])
 
-        self.luxury_profit.display(str(self.model.current_luxury_total_earnings))
-        self.junior_profit.display(str(self.model.current_junior_total_earnings))
-        self.double_profit.display(str(self.model.current_double_total_earnings))
-        self.single_profit.display(str(self.model.current_single_total_earnings))
-        self.total_profit.display(str(self.model.current_hotel_total_earnings))
+        self.luxury_profit.display(str(statistics['current_luxury_total_earnings']))
+        self.junior_profit.display(str(statistics['current_junior_total_earnings']))
+        self.double_profit.display(str(statistics['current_double_total_earnings']))
+        self.single_profit.display(str(statistics['current_single_total_earnings']))
+        self.total_profit.display(str(statistics['current_hotel_total_earnings']))
 
-        self.luxury_served_guests.display(str(self.model.luxury_served_guests))
-        self.junior_served_guests.display(str(self.model.junior_served_guests))
-        self.double_served_guests.display(str(self.model.double_served_guests))
-        self.single_served_guests.display(str(self.model.single_served_guests))
-        self.hotel_served_guests.display(str(self.model.hotel_served_guests))
+        self.luxury_served_guests.display(str(statistics['luxury_served_guests']))
+        self.junior_served_guests.display(str(statistics['junior_served_guests']))
+        self.double_served_guests.display(str(statistics['double_served_guests']))
+        self.single_served_guests.display(str(statistics['single_served_guests']))
+        self.hotel_served_guests.display(str(statistics['hotel_served_guests']))
 
-        self.total_lost_clients.display(str(self.model.total_lost_clients))
-        self.percent_served_guests.setValue(self.model.percent_of_surved_clients)
+        self.total_lost_clients.display(str(statistics['total_lost_clients']))
+        self.percent_served_guests.setValue(statistics['percent_of_surved_clients'])
 
-        logger.debug(f"TOTAL PROFIT = {self.model.current_hotel_total_earnings}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"TOTAL PROFIT = {statistics['current_hotel_total_earnings']}")
+        if self.show_perf_stats:
+            self.main_window.statusBar().showMessage(format_perf_stats(self.model.perf_stats()))
 
     def to_the_end(self):
-        while self.total_ticks > 0:
-            self.model_tick()
-            self.total_ticks -= 1
+        # only the final values are shown, so run without per-tick statistics
+        self.show_statistics(self.model.run())
+        self.total_ticks = 0
 
 
     def setupUi(self, HotelModelUI):
+        self.main_window = HotelModelUI
         HotelModelUI.setObjectName("HotelModelUI")
         HotelModelUI.resize(1300, 800)
         self.left_line = QtWidgets.QFrame(HotelModelUI)
@@ -1,21 +1,64 @@
+import atexit
 import datetime
 import logging
+import logging.handlers
+import queue
+import typing as tp
 from pathlib import Path
 
 HOURS_PER_DAY = 24
 
-def get_logger():
-    logs_path = Path('./logs')
-    logs_path.mkdir(exist_ok=True)
-    logging.basicConfig(
-        filemode='w',
-        format='[%(levelname)s] %(message)s',
-        filename=logs_path / f'{datetime.datetime.now().strftime("%m_%d_%Y_%H_%M_%S")}.txt',
-        level=logging.DEBUG,
-        encoding='utf-8',
-    )
-    logger = logging.getLogger(__name__)
-
-    return logger
-
-logger = get_logger()
\ No newline at end of file
+LOG_FORMAT = '[%(levelname)s] %(message)s'
+
+# package logger, silent below WARNING until configure_logging is called
+logger = logging.getLogger('src')
+logger.setLevel(logging.WARNING)
+
+_listener: tp.Optional[logging.handlers.QueueListener] = None
+
+
+def configure_logging(
+    level: tp.Union[int, str] = logging.WARNING,
+    log_dir: tp.Optional[tp.Union[str, Path]] = None,
+) -> logging.handlers.QueueListener:
+    """
+    Set the package log level and send records through a queue to a background
+    writer: a timestamped file in log_dir, or stderr without log_dir.
+    The simulation thread only puts records into the queue.
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in [handler for handler in logger.handlers if isinstance(handler, logging.handlers.QueueHandler)]:
+            logger.removeHandler(handler)
+            handler.close()
+        # the old log file would stay open until exit otherwise
+        for handler in _listener.handlers:
+            handler.close()
+
+    if log_dir is None:
+        handler = logging.StreamHandler()
+    else:
+        logs_path = Path(log_dir)
+        logs_path.mkdir(parents=True, exist_ok=True)
+        handler = logging.FileHandler(
+            logs_path / f'{datetime.datetime.now().strftime("%m_%d_%Y_%H_%M_%S")}.txt',
+            mode='w',
+            encoding='utf-8',
+        )
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    logger.setLevel(level.upper() if isinstance(level, str) else level)
+    logger.propagate = False
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+    return _listener
+
+
+@atexit.register
+def _stop_logging():
+    """Flush records still in the queue on exit"""
+    if _listener is not None:
+        _listener.stop()
@@ -0,0 +1,32 @@
+import typing as tp
+
+MSER_BATCH_SIZE = 5
+
+
+def mser(series: tp.Sequence[float], batch_size: int = MSER_BATCH_SIZE) -> int:
+    """
+    Warm-up length by MSER (MSER-5 with the default batch size):
+    the truncation point d that minimizes the squared standard error
+    of the mean of the batch means left after dropping the first d,
+    searched over the first half of the series.
+    Returns the number of observations to drop.
+    """
+    batches = [
+        sum(series[start:start + batch_size]) / batch_size
+        for start in range(0, len(series) - batch_size + 1, batch_size)
+    ]
+    if len(batches) < 2:
+        return 0
+    # suffix sums give every truncation in one pass from the end
+    best, best_statistic = 0, None
+    total = squares = 0.0
+    for truncated in range(len(batches) - 1, -1, -1):
+        total += batches[truncated]
+        squares += batches[truncated] ** 2
+        kept = len(batches) - truncated
+        if truncated > len(batches) // 2 or kept < 2:
+            continue
+        statistic = (squares - total * total / kept) / kept ** 2
+        if best_statistic is None or statistic <= best_statistic:
+            best, best_statistic = truncated, statistic
+    return best * batch_size
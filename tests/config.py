@@ -0,0 +1,15 @@
+"""Small hotel shared by the tests, it fills up and loses guests within days"""
+CONFIG = {
+    'modeling_days': 60,
+    'model_number_of_luxury_rooms': 3,
+    'model_cost_of_luxury_rooms': 5,
+    'model_number_of_junior_suites': 4,
+    'model_cost_of_junior_suites': 4,
+    'model_number_of_double_rooms': 6,
+    'model_cost_of_double_rooms': 2,
+    'model_number_of_single_rooms': 20,
+    'model_cost_of_single_rooms': 1,
+    'new_application_hours': (1, 3),
+    'discount_percent': 20,
+    'tick_hours': 4,
+}
@@ -0,0 +1,15 @@
+import json
+import re
+
+from src.cli import main
+
+
+def test_drawn_seed_is_printed_and_repeats_the_run(capsys):
+    assert main(['--modeling-days', '5']) == 0
+    drawn = capsys.readouterr()
+    seed = re.search(r'--seed (\d+)', drawn.err).group(1)
+
+    assert main(['--modeling-days', '5', '--seed', seed]) == 0
+    repeated = capsys.readouterr()
+    assert json.loads(repeated.out) == json.loads(drawn.out)
+    assert repeated.err == ''
@@ -0,0 +1,15 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.comparison import compare_configs
+from tests.config import CONFIG
+
+
+def test_the_same_seed_object_repeats_the_comparison():
+    configs = [CONFIG, {**CONFIG, 'discount_percent': 50}]
+    seed = np.random.SeedSequence(7)
+    first = compare_configs(configs, 3, seed=seed, workers=1)
+    second = compare_configs(configs, 3, seed=seed, workers=1)
+    assert first.records == second.records
+    assert compare_configs(configs, 3, seed=7, workers=1).records == first.records
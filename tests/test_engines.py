@@ -0,0 +1,36 @@
+"""
+The table engine has to reproduce the object engine exactly:
+every statistics snapshot of a run, tick by tick.
+"""
+import pytest
+
+pytest.importorskip('numpy') # the table engine and the numpy arrivals need numpy
+
+from src.hotel import BEST_FIT, FIRST_FIT
+from src.modeling import NUMPY_ARRIVALS, OBJECT_ENGINE, PYTHON_ARRIVALS, TABLE_ENGINE, HotelModel
+from src.replications import engine_differences
+from tests.config import CONFIG
+
+SEEDS = (0, 1, 7, 2024)
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+@pytest.mark.parametrize('room_choice', (FIRST_FIT, BEST_FIT))
+@pytest.mark.parametrize('arrivals', (PYTHON_ARRIVALS, NUMPY_ARRIVALS))
+def test_table_engine_matches_object_engine(seed, room_choice, arrivals):
+    config = {**CONFIG, 'room_choice': room_choice, 'arrivals': arrivals}
+    assert engine_differences(config, seed, engines=(OBJECT_ENGINE, TABLE_ENGINE)) == []
+
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_engines_match_with_legacy_fallback(seed):
+    config = {**CONFIG, 'legacy_fallback': True}
+    assert engine_differences(config, seed, engines=(OBJECT_ENGINE, TABLE_ENGINE)) == []
+
+
+@pytest.mark.parametrize('engine', (OBJECT_ENGINE, TABLE_ENGINE))
+def test_compared_runs_book_and_lose_guests(engine):
+    # a hotel that is never full or never used would make the comparison vacuous
+    statistics = HotelModel(**CONFIG, engine=engine, seed=SEEDS[0]).run()
+    assert statistics['hotel_served_guests'] > 0
+    assert statistics['total_lost_clients'] > 0
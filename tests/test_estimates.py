@@ -0,0 +1,56 @@
+import math
+import random
+import statistics
+
+import pytest
+
+from src.estimates import RunningStatistics, summarize_samples, t_cdf, t_quantile
+
+
+# Abramowitz and Stegun table 26.10 and the usual t tables
+@pytest.mark.parametrize('probability, degrees_of_freedom, quantile', (
+    (0.975, 1, 12.7062),
+    (0.975, 2, 4.3027),
+    (0.995, 3, 5.8409),
+    (0.975, 3, 3.1824),
+    (0.975, 4, 2.7764),
+    (0.95, 5, 2.0150),
+    (0.975, 10, 2.2281),
+    (0.9995, 20, 3.8495),
+    (0.995, 30, 2.7500),
+    (0.975, 100, 1.9840),
+    (0.975, 5000, 1.9604),
+))
+def test_t_quantile_matches_tables(probability, degrees_of_freedom, quantile):
+    assert t_quantile(probability, degrees_of_freedom) == pytest.approx(quantile, abs=1e-4)
+    assert t_quantile(1 - probability, degrees_of_freedom) == pytest.approx(-quantile, abs=1e-4)
+
+
+@pytest.mark.parametrize('degrees_of_freedom', (3, 4, 9, 30, 999))
+def test_t_quantile_inverts_the_cdf(degrees_of_freedom):
+    for probability in (0.5, 0.6, 0.9, 0.975, 0.995, 0.99999):
+        assert t_cdf(t_quantile(probability, degrees_of_freedom), degrees_of_freedom) == pytest.approx(probability, abs=1e-12)
+
+
+def test_running_statistics_match_the_sample_ones():
+    rng = random.Random(4)
+    samples = [1e6 + rng.gauss(0, 3) for _ in range(500)] # a large mean loses digits in sums of squares
+    running = RunningStatistics()
+    for count, value in enumerate(samples, start=1):
+        running.add(value)
+        if count in (2, 3, 10, 500):
+            assert running.count == count
+            assert running.mean == pytest.approx(statistics.fmean(samples[:count]), rel=1e-12)
+            assert running.std == pytest.approx(statistics.stdev(samples[:count]), rel=1e-9)
+    summary, expected = running.summary(0.9), summarize_samples(samples, 0.9)
+    assert (summary.ci_low, summary.ci_high) == pytest.approx((expected.ci_low, expected.ci_high), rel=1e-12)
+
+
+def test_running_statistics_of_too_few_samples():
+    running = RunningStatistics()
+    assert math.isnan(running.mean)
+    running.add(5.0)
+    assert running.mean == 5.0
+    assert math.isnan(running.variance)
+    summary = running.summary()
+    assert (summary.ci_low, summary.ci_high) == (-math.inf, math.inf)
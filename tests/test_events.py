@@ -0,0 +1,46 @@
+import pytest
+
+from src.events import run_event_driven
+from src.modeling import HotelModel
+from src.utils import HOURS_PER_DAY
+from tests.config import CONFIG
+
+
+def _model(**overrides):
+    return HotelModel(**{**CONFIG, **overrides}, seed=2)
+
+
+@pytest.mark.parametrize('tick_hours', (CONFIG['tick_hours'], 5)) # departure hours are off a 5-hour grid
+def test_reports_match_ticked_snapshots(tick_hours):
+    report_ticks = (1, 5, 6, 42, 100)
+    snapshots = run_event_driven(_model(tick_hours=tick_hours), [tick * tick_hours for tick in report_ticks])
+
+    ticked = _model(tick_hours=tick_hours)
+    expected = []
+    for tick in range(1, ticked.total_ticks + 1):
+        statistics = ticked.advance(1)
+        if tick in report_ticks or tick == ticked.total_ticks:
+            expected.append((tick * tick_hours, statistics))
+    assert snapshots == expected
+
+
+def test_off_grid_hours_are_rejected():
+    model = _model(tick_hours=5)
+    with pytest.raises(ValueError):
+        model.advance_to_hour(7)
+    assert model.current_hour == 0
+    model.advance_to_hour(10)
+    assert model.current_hour == 10
+    with pytest.raises(ValueError):
+        run_event_driven(_model(tick_hours=5), [7])
+
+
+def test_departures_are_served_at_their_hour():
+    model = _model()
+    model.receive_arrivals(30 * HOURS_PER_DAY)
+    served = model.hotel_served_guests
+    model.move_clock(10 * HOURS_PER_DAY + 1) # off the tick grid
+    assert model.current_hour == 10 * HOURS_PER_DAY + 1
+    assert model.hotel_served_guests > served
+    with pytest.raises(ValueError):
+        model.move_clock(HOURS_PER_DAY)
@@ -0,0 +1,14 @@
+import logging
+
+from src.utils import configure_logging, logger
+
+
+def test_reconfiguring_closes_the_old_log_file(tmp_path):
+    first = configure_logging(logging.INFO, tmp_path / 'first')
+    (old_file,) = first.handlers
+    configure_logging(logging.INFO, tmp_path / 'second')
+    try:
+        assert old_file.stream is None # FileHandler.close drops its stream
+        assert sum(isinstance(handler, logging.handlers.QueueHandler) for handler in logger.handlers) == 1
+    finally:
+        configure_logging(logging.WARNING)
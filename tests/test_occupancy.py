@@ -0,0 +1,104 @@
+import collections
+import random
+
+import pytest
+
+from src.occupancy import CategoryIndex, FreeIntervals, OccupancyWindow, RoomDaysSum, iter_bits
+
+
+def _random_stays(rng: random.Random, count: int, horizon: int):
+    for _ in range(count):
+        first_day = rng.randrange(horizon)
+        yield first_day, first_day + rng.randrange(10)
+
+
+def test_room_days_sum_matches_naive_counts_past_its_initial_size():
+    rng = random.Random(1)
+    room_days = RoomDaysSum(size=8)
+    naive = [0] * 300
+    for first_day, last_day in _random_stays(rng, 200, 290): # the trees double from 8 to 512
+        rooms = rng.randrange(1, 4)
+        room_days.add(first_day, last_day, rooms)
+        for day in range(first_day, last_day + 1):
+            naive[day] += rooms
+        day = rng.randrange(-1, 300)
+        assert room_days.on_day(day) == (naive[day] if day >= 0 else 0)
+        assert room_days.prefix(day) == sum(naive[:day+1])
+    for first_day in range(0, 300, 7):
+        for last_day in (first_day, first_day + 6, 299):
+            assert room_days.total(first_day, last_day) == sum(naive[first_day:last_day+1])
+    assert room_days.on_day(1000) == 0
+    assert room_days.prefix(1000) == sum(naive)
+
+
+def test_free_intervals_split_around_bookings():
+    rng = random.Random(2)
+    horizon = 100
+    intervals = FreeIntervals(horizon)
+    busy = [False] * (horizon + 1)
+    for first_day, last_day in _random_stays(rng, 200, horizon - 10):
+        free = not any(busy[first_day:last_day+1])
+        assert intervals.is_free(first_day, last_day) == free
+        if not free:
+            with pytest.raises(ValueError):
+                intervals.occupy(first_day, last_day)
+            continue
+        start, end = first_day, last_day
+        while start > 0 and not busy[start-1]:
+            start -= 1
+        while end < horizon and not busy[end+1]:
+            end += 1
+        assert intervals.gap(first_day, last_day) == (start, end)
+        intervals.occupy(first_day, last_day)
+        busy[first_day:last_day+1] = [True] * (last_day - first_day + 1)
+    # one interval per run of free days
+    runs = sum(1 for day in range(horizon + 1) if not busy[day] and (day == 0 or busy[day-1]))
+    assert len(intervals) == runs
+
+
+def test_category_index_first_fit_matches_naive_calendars():
+    rng = random.Random(3)
+    rooms = 70 # more rooms than bits in a machine word
+    index = CategoryIndex(rooms)
+    busy = [set() for _ in range(rooms)]
+    for first_day, last_day in _random_stays(rng, 2000, 120):
+        stay = set(range(first_day, last_day + 1))
+        free = [room_id for room_id in range(rooms) if not busy[room_id] & stay]
+        assert list(iter_bits(index.free_rooms(first_day, last_day))) == free
+        assert index.first_free_room(first_day, last_day) == (free[0] if free else -1)
+        if free:
+            room_id = rng.choice(free)
+            index.occupy(room_id, first_day, last_day)
+            busy[room_id] |= stay
+    # days after the last booked one are free for every room
+    assert index.first_free_room(500, 510) == 0
+
+
+@pytest.mark.parametrize('length', (1, 7, 30))
+def test_occupancy_window_matches_naive_sums(length):
+    rng = random.Random(length)
+    room_days = RoomDaysSum()
+    window = OccupancyWindow(room_days, length)
+    naive = collections.Counter()
+    first_day = 0
+    for step in range(300):
+        stay_first = first_day + rng.randrange(-5, 40)
+        stay_last = max(stay_first, 0) + rng.randrange(8)
+        stay_first = max(stay_first, 0)
+        room_days.add(stay_first, stay_last)
+        window.add(stay_first, stay_last)
+        for day in range(stay_first, stay_last + 1):
+            naive[day] += 1
+        # steps inside the window, to its edge and past it
+        first_day += rng.choice((0, 1, length - 1, length, length + 3)) if step % 3 == 0 else 0
+        window.advance(first_day)
+        assert window.last_day == first_day + length - 1
+        assert window.occupied == sum(naive[day] for day in range(first_day, window.last_day + 1))
+
+
+def test_occupancy_window_starts_from_the_bookings_so_far():
+    room_days = RoomDaysSum()
+    room_days.add(3, 9)
+    assert OccupancyWindow(room_days, 7, first_day=5).occupied == 5
+    with pytest.raises(ValueError):
+        OccupancyWindow(room_days, 0)
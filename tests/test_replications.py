@@ -0,0 +1,29 @@
+import pytest
+
+np = pytest.importorskip('numpy') # replication seeds are spawned SeedSequences
+
+from src.replications import run_replications, run_until_precision
+from tests.config import CONFIG
+
+
+def _until_precision(**kwargs):
+    configs = [CONFIG, {**CONFIG, 'model_number_of_single_rooms': 10}]
+    results = run_until_precision(configs, relative_half_width=0.01, max_replications=12, min_replications=2, **kwargs)
+    return [(result.records, result.converged) for result in results]
+
+
+def test_stopping_point_does_not_depend_on_workers():
+    assert _until_precision(seed=5, workers=1) == _until_precision(seed=5, workers=2)
+
+
+def test_batch_size_must_be_positive():
+    with pytest.raises(ValueError):
+        run_until_precision([CONFIG], batch_size=0, seed=5, workers=1)
+
+
+def test_the_same_seed_object_repeats_the_runs():
+    seed = np.random.SeedSequence(5)
+    assert _until_precision(seed=seed, workers=1) == _until_precision(seed=seed, workers=1)
+    assert _until_precision(seed=seed, workers=1) == _until_precision(seed=5, workers=1)
+    first = run_replications(CONFIG, 3, seed=seed, workers=1)
+    assert run_replications(CONFIG, 3, seed=seed, workers=1).records == first.records
@@ -0,0 +1,43 @@
+import random
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from src.hotel import CATEGORY_NAMES, SINGLE
+from src.room_table import RoomTable
+
+
+def _naive_best_free_room(occupancy: np.ndarray, first_day: int, last_day: int) -> int:
+    """The shortest free gap around the stay from a plain rooms x days matrix"""
+    best_room, best_gap = -1, None
+    for room_id, days in enumerate(occupancy):
+        if days[first_day:last_day+1].any():
+            continue
+        busy_before = np.flatnonzero(days[:first_day])
+        busy_after = np.flatnonzero(days[last_day+1:])
+        gap_start = busy_before[-1] + 1 if busy_before.size else 0
+        gap_end = last_day + busy_after[0] if busy_after.size else sys.maxsize
+        if best_gap is None or gap_end - gap_start < best_gap:
+            best_room, best_gap = room_id, gap_end - gap_start
+    return best_room
+
+
+@pytest.mark.parametrize('rooms', (1, 7, 8, 21, 300))
+def test_free_room_choice_matches_a_naive_scan(rooms):
+    rng = random.Random(rooms)
+    number_of_rooms = dict.fromkeys(CATEGORY_NAMES, 1)
+    number_of_rooms[SINGLE] = rooms
+    table = RoomTable(number_of_rooms, dict.fromkeys(CATEGORY_NAMES, 1), days=8)
+    for _ in range(4 * rooms):
+        first_day = rng.randrange(200) # past the initial days, the table has to grow
+        last_day = first_day + rng.randrange(6)
+        occupancy = table.occupancy(SINGLE, 0, table.days - 1)
+        best = _naive_best_free_room(occupancy, first_day, last_day)
+        assert table.best_free_room(SINGLE, first_day, last_day) == best
+        free = np.flatnonzero(~occupancy[:, first_day:last_day+1].any(axis=1))
+        assert table.first_free_room(SINGLE, first_day, last_day) == (free[0] if free.size else -1)
+        room_id = rng.choice(free.tolist()) if free.size else -1 # random rooms leave gaps of every length
+        if room_id != -1:
+            table.occupy(SINGLE, room_id, first_day, last_day)
@@ -0,0 +1,35 @@
+import pytest
+
+from src.modeling import STATISTICS, STEADY_STATE_STATISTICS, HotelModel
+from tests.config import CONFIG
+
+STEADY_CONFIG = {**CONFIG, 'modeling_days': 40, 'steady_state': True}
+
+
+def test_snapshot_has_steady_state_kpis_only_on_request():
+    assert tuple(HotelModel(**CONFIG, seed=1).run()) == STATISTICS
+    statistics = HotelModel(**STEADY_CONFIG, seed=1).run()
+    assert tuple(statistics) == STATISTICS + STEADY_STATE_STATISTICS
+    assert 0 <= statistics['steady_state_warmup_days'] < STEADY_CONFIG['modeling_days'] // 2
+    assert 0 < statistics['steady_state_hotel_occupation_percent'] <= 100
+
+
+def test_steady_state_kpis_in_replications_and_sweeps(tmp_path):
+    pytest.importorskip('numpy') # replication seeds are spawned with numpy
+    from src.comparison import compare_configs
+    from src.replications import run_replications, run_until_precision
+    from src.sweep import run_sweep, summarize_sweep
+
+    result = run_replications(STEADY_CONFIG, 3, seed=1, workers=1)
+    assert set(STEADY_STATE_STATISTICS) <= set(result.summary)
+    assert len(result.samples('steady_state_hotel_occupation_percent')) == 3
+
+    comparison = compare_configs([STEADY_CONFIG, {**STEADY_CONFIG, 'discount_percent': 50}], 3, seed=1, workers=1)
+    assert 'steady_state_hotel_occupation_percent' in comparison.differences(1)
+
+    path = str(tmp_path / 'sweep.jsonl')
+    run_sweep(STEADY_CONFIG, [{}], 2, path, seed=1, workers=1)
+    assert set(STEADY_STATE_STATISTICS) <= set(summarize_sweep(path)[0])
+
+    with pytest.raises(ValueError):
+        run_until_precision([CONFIG], kpis=('steady_state_hotel_occupation_percent',), seed=1, workers=1)
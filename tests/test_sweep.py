@@ -0,0 +1,68 @@
+import pytest
+
+pytest.importorskip('numpy') # sweeps sample parameters and spawn seeds with numpy
+
+from src.sweep import grid, read_sweep, run_sweep, sweep_jobs
+from tests.config import CONFIG
+
+BASE_CONFIG = {**CONFIG, 'modeling_days': 20}
+SCENARIOS = [{'discount_percent': 10}, {'discount_percent': 30}]
+REPLICATIONS = 3
+JOBS = len(SCENARIOS) * REPLICATIONS
+
+
+def _sweep(path, seed=None):
+    return run_sweep(BASE_CONFIG, SCENARIOS, REPLICATIONS, str(path), seed=seed, workers=1, chunk_size=2)
+
+
+def _results(path):
+    return sorted(read_sweep(str(path)), key=lambda record: (record['scenario'], record['replication']))
+
+
+def _cut(path, records: int, tail: bytes = b''):
+    lines = path.read_bytes().splitlines(keepends=True)
+    path.write_bytes(b''.join(lines[:records]) + tail)
+
+
+def test_job_seeds_depend_only_on_the_position():
+    jobs = list(sweep_jobs(BASE_CONFIG, SCENARIOS, REPLICATIONS, 11))
+    again = list(sweep_jobs(BASE_CONFIG, SCENARIOS[:1], 1, 11))
+    assert jobs[0][3].spawn_key == (0, 0)
+    assert jobs[0][3].generate_state(4).tolist() == again[0][3].generate_state(4).tolist()
+
+
+@pytest.mark.parametrize('seed', (5, None))
+def test_resumed_sweep_matches_an_uninterrupted_one(tmp_path, seed):
+    full, resumed = tmp_path / 'full.jsonl', tmp_path / 'resumed.jsonl'
+    assert _sweep(full, seed) == JOBS
+    resumed.write_bytes(full.read_bytes())
+    _cut(resumed, 2)
+    assert _sweep(resumed, seed) == JOBS - 2
+    assert _results(resumed) == _results(full)
+    assert _sweep(resumed, seed) == 0
+
+
+def test_cut_off_last_line_is_truncated_and_rerun(tmp_path):
+    full, resumed = tmp_path / 'full.jsonl', tmp_path / 'resumed.jsonl'
+    _sweep(full, 5)
+    lines = full.read_bytes().splitlines(keepends=True)
+    resumed.write_bytes(b''.join(lines[:3]) + lines[3][:len(lines[3]) // 2])
+    assert _sweep(resumed, 5) == JOBS - 3
+    assert resumed.read_bytes().startswith(b''.join(lines[:3]))
+    assert _results(resumed) == _results(full)
+
+
+def test_resume_with_another_seed_is_refused(tmp_path):
+    path = tmp_path / 'sweep.jsonl'
+    _sweep(path, 5)
+    _cut(path, 2)
+    with pytest.raises(ValueError):
+        _sweep(path, 6)
+
+
+def test_scenario_without_rooms_is_refused_before_running(tmp_path):
+    path = tmp_path / 'sweep.jsonl'
+    scenarios = grid({'model_number_of_luxury_rooms': [0, 1, 2]})
+    with pytest.raises(ValueError, match='model_number_of_luxury_rooms=0'):
+        run_sweep(BASE_CONFIG, scenarios, REPLICATIONS, str(path), seed=1, workers=1)
+    assert not path.exists()
@@ -0,0 +1,32 @@
+import pytest
+
+np = pytest.importorskip('numpy') # read_trace returns a numpy array
+
+from src.events import run_event_driven
+from src.modeling import HotelModel
+from src.trace import BOOKED, DEPARTED, LOST, TraceWriter, read_trace
+from src.utils import HOURS_PER_DAY
+from tests.config import CONFIG
+
+
+def _trace(path, run):
+    with TraceWriter(str(path)) as trace:
+        run(HotelModel(**CONFIG, seed=3, trace=trace))
+    return read_trace(str(path))
+
+
+def test_record_hours_are_arrival_and_departure_hours(tmp_path):
+    events = _trace(tmp_path / 'run.trace', lambda model: model.run())
+    arrivals = events[events['outcome'] != DEPARTED]
+    departures = events[events['outcome'] == DEPARTED]
+    assert set(np.unique(arrivals['outcome'])) == {BOOKED, LOST}
+    # arrivals are not rounded up to the tick that received them
+    assert np.any(arrivals['hour'] % CONFIG['tick_hours'])
+    assert np.all(np.diff(arrivals['hour']) >= 0)
+    assert np.array_equal(departures['hour'], departures['day_out'].astype(np.int64) * HOURS_PER_DAY)
+
+
+def test_tick_and_event_driven_runs_write_the_same_trace(tmp_path):
+    ticked = _trace(tmp_path / 'ticked.trace', lambda model: model.run())
+    event_driven = _trace(tmp_path / 'events.trace', run_event_driven)
+    assert np.array_equal(np.sort(ticked, order=('guest_id', 'outcome')), np.sort(event_driven, order=('guest_id', 'outcome')))
@@ -0,0 +1,38 @@
+import random
+
+import pytest
+
+from src.warmup import mser
+
+
+def _naive_mser(series, batch_size):
+    batches = [
+        sum(series[start:start + batch_size]) / batch_size
+        for start in range(0, len(series) - batch_size + 1, batch_size)
+    ]
+    best, best_statistic = 0, None
+    for truncated in range(len(batches) // 2 + 1):
+        kept = batches[truncated:]
+        if len(kept) < 2:
+            break
+        mean = sum(kept) / len(kept)
+        statistic = sum((batch - mean) ** 2 for batch in kept) / len(kept) ** 2
+        if best_statistic is None or statistic < best_statistic:
+            best, best_statistic = truncated, statistic
+    return best * batch_size
+
+
+@pytest.mark.parametrize('batch_size', (1, 5, 7))
+def test_mser_matches_a_naive_search(batch_size):
+    rng = random.Random(batch_size)
+    for length in (0, 4, 10, 11, 57, 300):
+        ramp = rng.randrange(length + 1)
+        series = [min(day, ramp) * 2 + rng.gauss(0, 3) for day in range(length)]
+        assert mser(series, batch_size) == _naive_mser(series, batch_size)
+
+
+def test_mser_drops_the_ramp_up():
+    rng = random.Random(0)
+    series = [min(day, 50) + rng.uniform(-1, 1) for day in range(500)]
+    assert 40 <= mser(series) <= 60
+    assert mser([10.0] * 100) == 0